@@ -17,153 +17,45 @@ Features:
 
 import customtkinter as ctk
 import math
-import ast
-import operator
-from typing import List, Optional, Tuple
+import functools
+import threading
+from collections import deque
+from typing import Deque, Optional, Tuple
 import numpy as np
-import matplotlib
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import sympy as sp
-from sympy import symbols, solve, simplify, expand, factor, diff, integrate
+from engine import (
+    CONVERSION_UNITS, convert_temperature, convert_units, factorial, lambdify_x, load_sympy,
+    make_trig_function, negate_literal, normalize_result, parse_matrix, preprocess_math_input,
+    safe_eval, solve, square_root, sympify, xgrid,
+)
 
 
-def preprocess_math_input(expression: str) -> str:
-    """
-    Preprocess mathematical expressions to make them more user-friendly.
-    Handles implicit multiplication, common notations, etc.
-    
-    Examples:
-        '2x' -> '2*x'
-        'x^2' -> 'x**2'
-        '2(x+1)' -> '2*(x+1)'
-        '(x)(y)' -> '(x)*(y)'
-        'sin x' -> 'sin(x)'
-        '2sin(x)' -> '2*sin(x)'
-    """
-    import re
-    
-    # First, replace ^ with **
-    expr = expression.replace('^', '**')
-    
-    # List of known mathematical functions  
-    known_funcs = ['sin', 'cos', 'tan', 'asin', 'acos', 'atan', 
-                   'sinh', 'cosh', 'tanh', 'log', 'ln', 'exp', 
-                   'sqrt', 'abs']
-    
-    # Step 1: Handle functions without parentheses (sin x -> sin(x))
-    for func in known_funcs:
-        pattern = rf'\b{func}\s+(?!\()([a-zA-Z_]\w*|\d+\.?\d*)'
-        expr = re.sub(pattern, rf'{func}(\1)', expr)
-    
-    # Step 2: Add multiplication for number followed by letter/function
-    # 2x -> 2*x, 2sin -> 2*sin
-    expr = re.sub(r'(\d)([a-zA-Z_])', r'\1*\2', expr)
-    
-    # Step 3: Add multiplication for number followed by opening paren
-    # 2(x) -> 2*(x)
-    expr = re.sub(r'(\d)\(', r'\1*(', expr)
-    
-    # Step 4: Add multiplication for closing paren followed by opening paren
-    # (x)(y) -> (x)*(y)
-    expr = re.sub(r'\)\s*\(', r')*(', expr)
-    
-    # Step 5: Add multiplication for closing paren followed by letter/digit
-    # )x -> )*x, )2 -> )*2
-    expr = re.sub(r'\)([a-zA-Z_0-9])', r')*\1', expr)
-    
-    # Step 6: Add multiplication for letter followed by opening paren (not a function)
-    # We do this by scanning and checking if identifier is not a function
-    parts = []
-    i = 0
-    while i < len(expr):
-        if expr[i] == '(' and i > 0:
-            # Look back to find the identifier
-            j = i - 1
-            while j >= 0 and (expr[j].isalnum() or expr[j] == '_'):
-                j -= 1
-            identifier = expr[j+1:i]
-            if identifier and identifier not in known_funcs and identifier.isalpha():
-                # Insert * before (
-                parts.append('*')
-        parts.append(expr[i])
-        i += 1
-    expr = ''.join(parts)
-    
-    # Step 7: Add multiplication between consecutive single letters (xy -> x*y)
-    # But avoid breaking function names
-    # We'll do this carefully by only splitting isolated single letters
-    result = []
-    i = 0
-    while i < len(expr):
-        result.append(expr[i])
-        if i < len(expr) - 1:
-            curr = expr[i]
-            next_char = expr[i + 1]
-            
-            # Check if we have two consecutive single letters
-            if curr.isalpha() and next_char.isalpha():
-                # Make sure current is not part of a longer identifier
-                prev_is_alnum = i > 0 and expr[i-1].isalnum()
-                next_next_is_alnum = i + 2 < len(expr) and expr[i+2].isalnum()
-                
-                # Only insert * if both are standalone single letters
-                if not prev_is_alnum and not next_next_is_alnum:
-                    result.append('*')
-        i += 1
-    
-    return ''.join(result)
+# Inserted by the π and e buttons
+_PI_STR = repr(math.pi)
+_E_STR = repr(math.e)
 
-
-def safe_eval(expression: str) -> float:
-    """
-    Safely evaluate a mathematical expression without using eval().
-    Only allows mathematical operations and prevents code injection.
-    """
-    allowed_operators = {
-        ast.Add: operator.add,
-        ast.Sub: operator.sub,
-        ast.Mult: operator.mul,
-        ast.Div: operator.truediv,
-        ast.Pow: operator.pow,
-        ast.Mod: operator.mod,
-        ast.USub: operator.neg,
-    }
-    
-    def eval_node(node):
-        """Recursively evaluate AST nodes."""
-        if isinstance(node, ast.Constant):
-            return node.value
-        elif isinstance(node, ast.Num):
-            return node.n
-        elif isinstance(node, ast.BinOp):
-            left = eval_node(node.left)
-            right = eval_node(node.right)
-            op = allowed_operators.get(type(node.op))
-            if op is None:
-                raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
-            return op(left, right)
-        elif isinstance(node, ast.UnaryOp):
-            operand = eval_node(node.operand)
-            op = allowed_operators.get(type(node.op))
-            if op is None:
-                raise ValueError(f"Unsupported unary operator: {type(node.op).__name__}")
-            return op(operand)
-        else:
-            raise ValueError(f"Unsupported expression: {type(node).__name__}")
-    
-    try:
-        tree = ast.parse(expression, mode='eval')
-        return eval_node(tree.body)
-    except (SyntaxError, ValueError, TypeError) as e:
-        raise ValueError(f"Invalid expression: {str(e)}")
+# Characters typed straight into the expression, and named keys mapped to handlers
+_CALC_KEYS = frozenset('0123456789.+-*/()')
+_KEYSYM_ACTIONS = {
+    'Return': 'calculate',
+    'BackSpace': 'backspace',
+    'Escape': 'clear',
+}
 
 
 class AdvancedCalculator(ctk.CTk):
     """Main advanced calculator application class with tabs."""
     
+    # Button label -> (fg_color, hover_color)
+    _DEFAULT_BUTTON_COLORS = ("#3b3b3b", "#2b2b2b")
+    _BUTTON_COLORS = {
+        '=': ("#1f6aa5", "#1a5a8f"),
+        **dict.fromkeys(['C', '⌫'], ("#c93d3d", "#b03535")),
+        **dict.fromkeys(['+', '-', '×', '÷', '%'], ("#6a6a6a", "#5a5a5a")),
+        **dict.fromkeys(['sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'log', 'ln', 'eˣ',
+                         'x²', '√', 'xʸ', '∛', 'x!', '1/x', '2nd'], ("#2b7a3d", "#246830")),
+        **dict.fromkeys(['π', 'e'], ("#8b5a8b", "#7a4a7a")),
+    }
+    
     def __init__(self):
         super().__init__()
         
@@ -176,11 +68,7 @@ class AdvancedCalculator(ctk.CTk):
         ctk.set_default_color_theme("blue")
         
         # Calculator state
-        self.current_input = ""
-        self.result_displayed = False
-        self.memory = 0
-        self.history: List[str] = []
-        self.angle_mode = "deg"  # deg or rad
+        self._init_state()
         
         # Create main UI
         self.create_main_ui()
@@ -188,6 +76,28 @@ class AdvancedCalculator(ctk.CTk):
         # Bind keyboard events
         self.bind('<Key>', self.handle_keypress)
         
+        # Import SymPy in the background so the first solve or plot doesn't wait for it
+        threading.Thread(target=load_sympy, daemon=True).start()
+        
+    def _init_state(self):
+        """Initialize the calculator state, which doesn't depend on any widgets."""
+        self.current_input = ""
+        self.result_displayed = False
+        self.memory = 0
+        self.history: Deque[str] = deque(maxlen=50)
+        self.angle_mode = "deg"  # deg or rad
+        self._last_result_str: Optional[str] = None
+        self._last_result_value = None
+        self._pending_display: Optional[str] = None
+        self._error_after_id: Optional[str] = None
+        # Result of the last solver-tab operation (a dict per variable for several)
+        self.last_solution = None
+        # Array (or determinant) produced by the last matrix operation
+        self.last_matrix_result = None
+        
+        # Button label -> handler, built once instead of walking an if/elif chain
+        self._button_actions = self._build_button_actions()
+        
     def create_main_ui(self):
         """Create the main tabbed interface."""
         # Header with theme toggle
@@ -210,7 +120,7 @@ class AdvancedCalculator(ctk.CTk):
         theme_btn.pack(side="right", padx=10)
         
         # Create tabview
-        self.tabview = ctk.CTkTabview(self, width=880, height=680)
+        self.tabview = ctk.CTkTabview(self, width=880, height=680, command=self.on_tab_change)
         self.tabview.pack(fill="both", expand=True, padx=10, pady=5)
         
         # Add tabs
@@ -293,6 +203,9 @@ class AdvancedCalculator(ctk.CTk):
             ['0', '.', '±', '+', '=']
         ]
         
+        # One font object shared by every button instead of one per widget
+        self._calc_button_font = ctk.CTkFont(family="Arial", size=16, weight="bold")
+        
         for i, row in enumerate(self.calc_buttons):
             for j, btn_text in enumerate(row):
                 self.create_calc_button(buttons_frame, i, j, btn_text)
@@ -431,7 +344,30 @@ class AdvancedCalculator(ctk.CTk):
         self.graph_frame = ctk.CTkFrame(graph_tab)
         self.graph_frame.pack(fill="both", expand=True, padx=5, pady=5)
         
-        # Create matplotlib figure
+        # The matplotlib figure is created when the tab is first used
+        self.fig = None
+        self.ax = None
+        self.canvas = None
+        # Line drawn by plot_function (reused by later plots) and lines from add_function
+        self._plot_line = None
+        self._added_lines = []
+        
+    def ensure_graph(self):
+        """Create the matplotlib figure and canvas on first use."""
+        if self.canvas is not None:
+            return
+        
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        self.create_figure()
+        self.canvas = FigureCanvasTkAgg(self.fig, self.graph_frame)
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        
+    def create_figure(self):
+        """Create the matplotlib figure and axes the graph is drawn on."""
+        from matplotlib.figure import Figure
+        
         self.fig = Figure(figsize=(8, 5), dpi=100)
         self.ax = self.fig.add_subplot(111)
         self.ax.grid(True, alpha=0.3)
@@ -439,9 +375,10 @@ class AdvancedCalculator(ctk.CTk):
         self.ax.set_ylabel('f(x)')
         self.ax.set_title('Function Graph')
         
-        self.canvas = FigureCanvasTkAgg(self.fig, self.graph_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+    def on_tab_change(self):
+        """Build the graph canvas the first time the Graphing tab is opened."""
+        if self.tabview.get() == "Graphing":
+            self.ensure_graph()
         
     def setup_solver_tab(self):
         """Setup the equation solver tab."""
@@ -596,12 +533,12 @@ class AdvancedCalculator(ctk.CTk):
         ops_frame.pack(fill="x", padx=20, pady=10)
         
         operations = [
-            ("Add (A+B)", lambda: self.matrix_operation("add")),
-            ("Subtract (A-B)", lambda: self.matrix_operation("subtract")),
-            ("Multiply (A×B)", lambda: self.matrix_operation("multiply")),
-            ("Transpose A", lambda: self.matrix_operation("transpose_a")),
-            ("Determinant A", lambda: self.matrix_operation("det_a")),
-            ("Inverse A", lambda: self.matrix_operation("inverse_a"))
+            ("Add (A+B)", functools.partial(self.matrix_operation, "add")),
+            ("Subtract (A-B)", functools.partial(self.matrix_operation, "subtract")),
+            ("Multiply (A×B)", functools.partial(self.matrix_operation, "multiply")),
+            ("Transpose A", functools.partial(self.matrix_operation, "transpose_a")),
+            ("Determinant A", functools.partial(self.matrix_operation, "det_a")),
+            ("Inverse A", functools.partial(self.matrix_operation, "inverse_a"))
         ]
         
         for i, (text, cmd) in enumerate(operations):
@@ -638,42 +575,7 @@ class AdvancedCalculator(ctk.CTk):
         ).pack(pady=10)
         
         # Conversion categories
-        categories = {
-            "Length": {
-                "meter": 1,
-                "kilometer": 1000,
-                "centimeter": 0.01,
-                "millimeter": 0.001,
-                "mile": 1609.34,
-                "yard": 0.9144,
-                "foot": 0.3048,
-                "inch": 0.0254
-            },
-            "Weight": {
-                "kilogram": 1,
-                "gram": 0.001,
-                "milligram": 0.000001,
-                "pound": 0.453592,
-                "ounce": 0.0283495,
-                "ton": 1000
-            },
-            "Temperature": {
-                "celsius": "C",
-                "fahrenheit": "F",
-                "kelvin": "K"
-            },
-            "Area": {
-                "sq_meter": 1,
-                "sq_kilometer": 1000000,
-                "sq_mile": 2589988,
-                "sq_yard": 0.836127,
-                "sq_foot": 0.092903,
-                "acre": 4046.86,
-                "hectare": 10000
-            }
-        }
-        
-        self.conversion_data = categories
+        self.conversion_data = CONVERSION_UNITS
         
         # Category selection
         cat_frame = ctk.CTkFrame(conv_tab)
@@ -687,7 +589,7 @@ class AdvancedCalculator(ctk.CTk):
         
         self.conv_category = ctk.CTkSegmentedButton(
             cat_frame,
-            values=list(categories.keys()),
+            values=list(self.conversion_data.keys()),
             command=self.update_conversion_units
         )
         self.conv_category.pack(side="left", padx=10)
@@ -717,7 +619,7 @@ class AdvancedCalculator(ctk.CTk):
         
         self.from_unit = ctk.CTkComboBox(
             from_frame,
-            values=list(categories["Length"].keys()),
+            values=list(self.conversion_data["Length"].keys()),
             width=150
         )
         self.from_unit.pack(side="left", padx=5)
@@ -743,7 +645,7 @@ class AdvancedCalculator(ctk.CTk):
         
         self.to_unit = ctk.CTkComboBox(
             to_frame,
-            values=list(categories["Length"].keys()),
+            values=list(self.conversion_data["Length"].keys()),
             width=150
         )
         self.to_unit.pack(side="left", padx=5)
@@ -768,93 +670,56 @@ class AdvancedCalculator(ctk.CTk):
     def create_calc_button(self, parent, row: int, col: int, text: str):
         """Create a calculator button with enhanced styling."""
         # Determine button color based on type
-        if text == '=':
-            fg_color = "#1f6aa5"
-            hover_color = "#1a5a8f"
-        elif text in ['C', '⌫']:
-            fg_color = "#c93d3d"
-            hover_color = "#b03535"
-        elif text in ['+', '-', '×', '÷', '%']:
-            fg_color = "#6a6a6a"
-            hover_color = "#5a5a5a"
-        elif text in ['sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'log', 'ln', 'eˣ', 
-                      'x²', '√', 'xʸ', '∛', 'x!', '1/x', '2nd']:
-            fg_color = "#2b7a3d"
-            hover_color = "#246830"
-        elif text in ['π', 'e']:
-            fg_color = "#8b5a8b"
-            hover_color = "#7a4a7a"
-        else:
-            fg_color = "#3b3b3b"
-            hover_color = "#2b2b2b"
+        fg_color, hover_color = self._BUTTON_COLORS.get(text, self._DEFAULT_BUTTON_COLORS)
         
         button = ctk.CTkButton(
             parent,
             text=text,
-            font=("Arial", 16, "bold"),
+            font=self._calc_button_font,
             fg_color=fg_color,
             hover_color=hover_color,
-            command=lambda t=text: self.calc_button_click(t)
+            command=functools.partial(self.calc_button_click, text)
         )
         button.grid(row=row, column=col, padx=2, pady=2, sticky="nsew")
         
+    def _build_button_actions(self) -> dict:
+        """Map calculator button labels to their handlers."""
+        return {
+            'C': self.clear,
+            '⌫': self.backspace,
+            '=': self.calculate,
+            '±': self.toggle_sign,
+            '%': self.percentage,
+            '√': self.square_root,
+            '∛': self.cube_root,
+            'x²': self.square,
+            'xʸ': functools.partial(self.append_to_input, '**'),
+            '1/x': self.reciprocal,
+            'x!': self.factorial,
+            'sin': functools.partial(self.trig_function, 'sin'),
+            'cos': functools.partial(self.trig_function, 'cos'),
+            'tan': functools.partial(self.trig_function, 'tan'),
+            'asin': functools.partial(self.trig_function, 'asin'),
+            'acos': functools.partial(self.trig_function, 'acos'),
+            'atan': functools.partial(self.trig_function, 'atan'),
+            'log': functools.partial(self.log_function, 'log10'),
+            'ln': functools.partial(self.log_function, 'log'),
+            'eˣ': self.exp_function,
+            'π': functools.partial(self.append_to_input, _PI_STR),
+            'e': functools.partial(self.append_to_input, _E_STR),
+            '×': functools.partial(self.append_to_input, '*'),
+            '÷': functools.partial(self.append_to_input, '/'),
+            '2nd': lambda: None,  # Toggle secondary functions
+        }
+        
     def calc_button_click(self, text: str):
         """Handle calculator button clicks."""
         try:
-            if text == 'C':
-                self.clear()
-            elif text == '⌫':
-                self.backspace()
-            elif text == '=':
-                self.calculate()
-            elif text == '±':
-                self.toggle_sign()
-            elif text == '%':
-                self.percentage()
-            elif text == '√':
-                self.square_root()
-            elif text == '∛':
-                self.cube_root()
-            elif text == 'x²':
-                self.square()
-            elif text == 'xʸ':
-                self.append_to_input('**')
-            elif text == '1/x':
-                self.reciprocal()
-            elif text == 'x!':
-                self.factorial()
-            elif text == 'sin':
-                self.trig_function('sin')
-            elif text == 'cos':
-                self.trig_function('cos')
-            elif text == 'tan':
-                self.trig_function('tan')
-            elif text == 'asin':
-                self.trig_function('asin')
-            elif text == 'acos':
-                self.trig_function('acos')
-            elif text == 'atan':
-                self.trig_function('atan')
-            elif text == 'log':
-                self.log_function('log10')
-            elif text == 'ln':
-                self.log_function('log')
-            elif text == 'eˣ':
-                self.exp_function()
-            elif text == 'π':
-                self.append_to_input(str(math.pi))
-            elif text == 'e':
-                self.append_to_input(str(math.e))
-            elif text in ['(', ')']:
+            action = self._button_actions.get(text)
+            if action is None:
                 self.append_to_input(text)
-            elif text == '×':
-                self.append_to_input('*')
-            elif text == '÷':
-                self.append_to_input('/')
-            elif text == '2nd':
-                pass  # Toggle secondary functions
             else:
-                self.append_to_input(text)
+                action()
                 
             # Update expression display
             self.expr_display.delete(0, "end")
@@ -870,7 +735,7 @@ class AdvancedCalculator(ctk.CTk):
             self.result_displayed = False
         
         self.current_input += text
-        self.update_display(self.current_input)
+        self.queue_display(self.current_input)
     
     def clear(self):
         """Clear the display."""
@@ -883,7 +748,7 @@ class AdvancedCalculator(ctk.CTk):
         """Delete last character."""
         if not self.result_displayed and self.current_input:
             self.current_input = self.current_input[:-1]
-            self.update_display(self.current_input if self.current_input else "0")
+            self.queue_display(self.current_input if self.current_input else "0")
     
     def calculate(self):
         """Evaluate the current expression."""
@@ -891,16 +756,11 @@ class AdvancedCalculator(ctk.CTk):
             return
         
         try:
-            result = safe_eval(self.current_input)
-            
-            if isinstance(result, float):
-                if result.is_integer():
-                    result = int(result)
-                else:
-                    result = round(result, 10)
+            result = normalize_result(safe_eval(self.current_input))
             
             self.add_to_history(f"{self.current_input} = {result}")
             self.current_input = str(result)
+            self._remember_result(result)
             self.update_display(self.current_input)
             self.result_displayed = True
             
@@ -909,12 +769,33 @@ class AdvancedCalculator(ctk.CTk):
         except (ValueError, TypeError, SyntaxError):
             self.display_error("Error")
     
+    def _remember_result(self, result):
+        """Keep the value behind current_input so follow-up operations skip re-parsing it."""
+        if isinstance(result, int) or (isinstance(result, float) and math.isfinite(result)):
+            self._last_result_str = self.current_input
+            self._last_result_value = result
+        else:
+            self._last_result_str = None
+    
+    def get_value(self):
+        """Return the number in current_input, reusing the last result instead of re-parsing it."""
+        if self.current_input == self._last_result_str:
+            return self._last_result_value
+        return safe_eval(self.current_input)
+    
     def toggle_sign(self):
         """Toggle the sign of the current number."""
         if self.current_input:
+            flipped = negate_literal(self.current_input)
+            if flipped is not None:
+                self.current_input = flipped
+                self.update_display(self.current_input)
+                self.result_displayed = True
+                return
             try:
-                value = safe_eval(self.current_input)
+                value = self.get_value()
                 self.current_input = str(-value)
+                self._remember_result(-value)
                 self.update_display(self.current_input)
                 self.result_displayed = True
             except (ValueError, TypeError, ZeroDivisionError):
@@ -924,160 +805,80 @@ class AdvancedCalculator(ctk.CTk):
         """Calculate percentage."""
         if self.current_input:
             try:
-                value = safe_eval(self.current_input)
+                value = self.get_value()
                 result = value / 100
                 self.current_input = str(result)
+                self._remember_result(result)
                 self.update_display(self.current_input)
                 self.result_displayed = True
             except (ValueError, TypeError, ZeroDivisionError):
                 self.display_error("Error")
     
+    def _apply_unary(self, func, label: str, validate=None):
+        """
+        Apply a one-argument function to the current value and show the result.
+        
+        ``label`` formats the history entry from the current input, e.g. "√({})".
+        ``validate`` may return an error message to display instead of computing.
+        """
+        if not self.current_input:
+            return
+        try:
+            value = self.get_value()
+            if validate is not None:
+                error = validate(value)
+                if error:
+                    self.display_error(error)
+                    return
+            result = func(value)
+            self.add_to_history(f"{label.format(self.current_input)} = {result}")
+            self.current_input = str(result)
+            self._remember_result(result)
+            self.update_display(self.current_input)
+            self.result_displayed = True
+        except (ValueError, TypeError, ZeroDivisionError):
+            self.display_error("Error")
+    
     def square_root(self):
         """Calculate square root."""
-        if self.current_input:
-            try:
-                value = safe_eval(self.current_input)
-                if value < 0:
-                    self.display_error("Invalid input")
-                    return
-                result = math.sqrt(value)
-                self.add_to_history(f"√({self.current_input}) = {result}")
-                self.current_input = str(result)
-                self.update_display(self.current_input)
-                self.result_displayed = True
-            except (ValueError, TypeError, ZeroDivisionError):
-                self.display_error("Error")
+        self._apply_unary(square_root, "√({})",
+                          lambda v: "Invalid input" if v < 0 else None)
     
     def cube_root(self):
         """Calculate cube root."""
-        if self.current_input:
-            try:
-                value = safe_eval(self.current_input)
-                result = value ** (1/3)
-                self.add_to_history(f"∛({self.current_input}) = {result}")
-                self.current_input = str(result)
-                self.update_display(self.current_input)
-                self.result_displayed = True
-            except (ValueError, TypeError, ZeroDivisionError):
-                self.display_error("Error")
+        self._apply_unary(lambda v: v ** (1/3), "∛({})")
     
     def square(self):
         """Calculate square."""
-        if self.current_input:
-            try:
-                value = safe_eval(self.current_input)
-                result = value ** 2
-                self.add_to_history(f"({self.current_input})² = {result}")
-                self.current_input = str(result)
-                self.update_display(self.current_input)
-                self.result_displayed = True
-            except (ValueError, TypeError, ZeroDivisionError):
-                self.display_error("Error")
+        # Multiply ints directly; floats keep ** so an overflow raises instead of giving inf
+        self._apply_unary(lambda v: v * v if type(v) is int else v ** 2, "({})²")
     
     def reciprocal(self):
         """Calculate reciprocal."""
-        if self.current_input:
-            try:
-                value = safe_eval(self.current_input)
-                if value == 0:
-                    self.display_error("Division by zero")
-                    return
-                result = 1 / value
-                self.add_to_history(f"1/({self.current_input}) = {result}")
-                self.current_input = str(result)
-                self.update_display(self.current_input)
-                self.result_displayed = True
-            except (ValueError, TypeError, ZeroDivisionError):
-                self.display_error("Error")
+        self._apply_unary(lambda v: 1 / v, "1/({})",
+                          lambda v: "Division by zero" if v == 0 else None)
     
     def factorial(self):
         """Calculate factorial."""
-        if self.current_input:
-            try:
-                value = safe_eval(self.current_input)
-                if value < 0 or not float(value).is_integer():
-                    self.display_error("Invalid input")
-                    return
-                result = math.factorial(int(value))
-                self.add_to_history(f"{self.current_input}! = {result}")
-                self.current_input = str(result)
-                self.update_display(self.current_input)
-                self.result_displayed = True
-            except (ValueError, TypeError, ZeroDivisionError):
-                self.display_error("Error")
+        self._apply_unary(
+            lambda v: factorial(int(v)), "{}!",
+            lambda v: "Invalid input" if v < 0 or not float(v).is_integer() else None)
     
     def trig_function(self, func: str):
         """Calculate trigonometric function."""
-        if self.current_input:
-            try:
-                value = safe_eval(self.current_input)
-                
-                if func in ['sin', 'cos', 'tan']:
-                    if self.angle_mode == "deg":
-                        radians = math.radians(value)
-                    else:
-                        radians = value
-                    
-                    if func == 'sin':
-                        result = math.sin(radians)
-                    elif func == 'cos':
-                        result = math.cos(radians)
-                    elif func == 'tan':
-                        result = math.tan(radians)
-                else:  # Inverse trig functions
-                    if func == 'asin':
-                        result = math.asin(value)
-                    elif func == 'acos':
-                        result = math.acos(value)
-                    elif func == 'atan':
-                        result = math.atan(value)
-                    
-                    if self.angle_mode == "deg":
-                        result = math.degrees(result)
-                
-                mode_str = "°" if self.angle_mode == "deg" else "rad"
-                self.add_to_history(f"{func}({self.current_input}{mode_str}) = {result}")
-                self.current_input = str(result)
-                self.update_display(self.current_input)
-                self.result_displayed = True
-            except (ValueError, TypeError, ZeroDivisionError):
-                self.display_error("Error")
+        degrees = self.angle_mode == "deg"
+        mode_str = "°" if degrees else "rad"
+        self._apply_unary(make_trig_function(func, degrees), f"{func}({{}}{mode_str})")
     
     def log_function(self, func: str):
         """Calculate logarithm."""
-        if self.current_input:
-            try:
-                value = safe_eval(self.current_input)
-                if value <= 0:
-                    self.display_error("Invalid input")
-                    return
-                
-                if func == 'log10':
-                    result = math.log10(value)
-                    func_name = "log"
-                elif func == 'log':
-                    result = math.log(value)
-                    func_name = "ln"
-                
-                self.add_to_history(f"{func_name}({self.current_input}) = {result}")
-                self.current_input = str(result)
-                self.update_display(self.current_input)
-                self.result_displayed = True
-            except (ValueError, TypeError, ZeroDivisionError):
-                self.display_error("Error")
+        func_name = "log" if func == 'log10' else "ln"
+        self._apply_unary(getattr(math, func), func_name + "({})",
+                          lambda v: "Invalid input" if v <= 0 else None)
     
     def exp_function(self):
         """Calculate e^x."""
-        if self.current_input:
-            try:
-                value = safe_eval(self.current_input)
-                result = math.exp(value)
-                self.add_to_history(f"e^({self.current_input}) = {result}")
-                self.current_input = str(result)
-                self.update_display(self.current_input)
-                self.result_displayed = True
-            except (ValueError, TypeError, ZeroDivisionError):
-                self.display_error("Error")
+        self._apply_unary(math.exp, "e^({})")
     
     def memory_clear(self):
         """Clear memory."""
@@ -1094,7 +895,7 @@ class AdvancedCalculator(ctk.CTk):
         """Add current value to memory."""
         if self.current_input:
             try:
-                value = safe_eval(self.current_input)
+                value = self.get_value()
                 self.memory += value
                 self.update_memory_indicator()
             except (ValueError, TypeError, ZeroDivisionError):
@@ -1104,7 +905,7 @@ class AdvancedCalculator(ctk.CTk):
         """Subtract current value from memory."""
         if self.current_input:
             try:
-                value = safe_eval(self.current_input)
+                value = self.get_value()
                 self.memory -= value
                 self.update_memory_indicator()
             except (ValueError, TypeError, ZeroDivisionError):
@@ -1124,26 +925,45 @@ class AdvancedCalculator(ctk.CTk):
     
     def update_display(self, text: str):
         """Update the display."""
+        self._pending_display = None  # supersedes any queued keystroke update
         self.display.delete(0, "end")
         self.display.insert(0, text)
     
+    def queue_display(self, text: str):
+        """Coalesce rapid display updates (typing, autorepeat) into one redraw on idle."""
+        if self._pending_display is None:
+            self.after_idle(self._flush_display)
+        self._pending_display = text
+    
+    def _flush_display(self):
+        """Apply the most recent queued display update."""
+        if self._pending_display is not None:
+            self.update_display(self._pending_display)
+    
     def display_error(self, message: str):
         """Display error message."""
         self.update_display(message)
-        self.after(2000, lambda: self.update_display("0"))
+        # Restart the reset timer rather than stacking one per error
+        if self._error_after_id is not None:
+            self.after_cancel(self._error_after_id)
+        self._error_after_id = self.after(2000, self._clear_error)
         self.current_input = ""
         self.result_displayed = False
     
+    def _clear_error(self):
+        """Reset the display after an error message has been shown."""
+        self._error_after_id = None
+        self.update_display("0")
+    
     def add_to_history(self, entry: str):
         """Add calculation to history."""
-        self.history.append(entry)
-        if len(self.history) > 50:
-            self.history.pop(0)
+        self.history.append(entry)  # deque drops the oldest entry past 50
         
-        # Update history display
-        self.history_text.delete("1.0", "end")
-        for item in reversed(self.history[-10:]):  # Show last 10
-            self.history_text.insert("1.0", item + "\n")
+        # Append the new line and drop the oldest once more than 10 are shown
+        self.history_text.insert("end", entry + "\n")
+        shown = int(self.history_text.index("end-1c").split(".")[0]) - 1
+        if shown > 10:
+            self.history_text.delete("1.0", f"{shown - 9}.0")
     
     def show_history(self):
         """Show full calculation history in a new window."""
@@ -1155,8 +975,7 @@ class AdvancedCalculator(ctk.CTk):
         history_text.pack(fill="both", expand=True, padx=10, pady=10)
         
         if self.history:
-            for entry in reversed(self.history):
-                history_text.insert("1.0", entry + "\n")
+            history_text.insert("1.0", "".join(entry + "\n" for entry in self.history))
         else:
             history_text.insert("1.0", "No history available")
         
@@ -1183,6 +1002,26 @@ class AdvancedCalculator(ctk.CTk):
             ctk.set_appearance_mode("dark")
     
     # Graphing functions
+    def sample_function(self, func_str: str, x_min: float, x_max: float,
+                        num_points: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate a user-entered function of x over [x_min, x_max].
+        The expression is turned into a NumPy function once and applied to
+        the whole grid in a single vectorized call.
+        """
+        # Create x values (shared while the range is unchanged)
+        x_vals = xgrid(x_min, x_max, num_points)
+        
+        # Preprocess the function string for user-friendly input
+        func_str_clean = preprocess_math_input(func_str)
+        
+        # Numpy function for vectorized evaluation, built once per expression
+        func = lambdify_x(func_str_clean)
+        
+        # Constant expressions come back as scalars; stretch them over the grid
+        y_vals = np.broadcast_to(func(x_vals), x_vals.shape)
+        return x_vals, y_vals
+    
     def plot_function(self):
         """Plot the function entered by user."""
         try:
@@ -1193,33 +1032,31 @@ class AdvancedCalculator(ctk.CTk):
             if not func_str:
                 return
             
-            # Create x values
-            x_vals = np.linspace(x_min, x_max, 1000)
-            
-            # Use sympy to evaluate the function safely
-            x = sp.Symbol('x')
-            
-            # Preprocess the function string for user-friendly input
-            func_str_clean = preprocess_math_input(func_str)
-            expr = sp.sympify(func_str_clean)
-            
-            # Convert to numpy function for vectorized evaluation
-            func = sp.lambdify(x, expr, modules=['numpy'])
+            x_vals, y_vals = self.sample_function(func_str, x_min, x_max)
+            self.ensure_graph()
             
-            # Evaluate function
-            y_vals = func(x_vals)
+            if self._plot_line is None:
+                # Clear and plot
+                self.ax.clear()
+                self.ax.grid(True, alpha=0.3)
+                self._plot_line, = self.ax.plot(x_vals, y_vals, 'b-', linewidth=2)
+                self.ax.axhline(y=0, color='k', linewidth=0.5)
+                self.ax.axvline(x=0, color='k', linewidth=0.5)
+                self.ax.set_xlabel('x', fontsize=11)
+                self.ax.set_ylabel('f(x)', fontsize=11)
+            else:
+                # Drop added functions and update the existing line in place
+                for line in self._added_lines:
+                    line.remove()
+                self._plot_line.set_data(x_vals, y_vals)
+                self.ax.relim()
+                self.ax.autoscale_view()
+            self._added_lines.clear()
             
-            # Clear and plot
-            self.ax.clear()
-            self.ax.grid(True, alpha=0.3)
-            self.ax.plot(x_vals, y_vals, 'b-', linewidth=2, label=self.func_entry.get())
-            self.ax.axhline(y=0, color='k', linewidth=0.5)
-            self.ax.axvline(x=0, color='k', linewidth=0.5)
-            self.ax.set_xlabel('x', fontsize=11)
-            self.ax.set_ylabel('f(x)', fontsize=11)
-            self.ax.set_title(f'Graph of f(x) = {self.func_entry.get()}', fontsize=12)
+            self._plot_line.set_label(func_str)
+            self.ax.set_title(f'Graph of f(x) = {func_str}', fontsize=12)
             self.ax.legend()
-            self.canvas.draw()
+            self.canvas.draw_idle()
             
             # Clear any previous error
             self.graph_error_label.configure(text="")
@@ -1238,26 +1075,14 @@ class AdvancedCalculator(ctk.CTk):
             if not func_str:
                 return
             
-            # Create x values
-            x_vals = np.linspace(x_min, x_max, 1000)
-            
-            # Use sympy to evaluate the function safely
-            x = sp.Symbol('x')
-            
-            # Preprocess the function string for user-friendly input
-            func_str_clean = preprocess_math_input(func_str)
-            expr = sp.sympify(func_str_clean)
-            
-            # Convert to numpy function for vectorized evaluation
-            func = sp.lambdify(x, expr, modules=['numpy'])
-            
-            # Evaluate function
-            y_vals = func(x_vals)
+            x_vals, y_vals = self.sample_function(func_str, x_min, x_max)
+            self.ensure_graph()
             
             # Add to existing plot
-            self.ax.plot(x_vals, y_vals, linewidth=2, label=self.func_entry.get())
+            line, = self.ax.plot(x_vals, y_vals, linewidth=2, label=func_str)
+            self._added_lines.append(line)
             self.ax.legend()
-            self.canvas.draw()
+            self.canvas.draw_idle()
             
             # Clear any previous error
             self.graph_error_label.configure(text="")
@@ -1267,16 +1092,21 @@ class AdvancedCalculator(ctk.CTk):
     
     def clear_graph(self):
         """Clear the graph."""
+        self.ensure_graph()
         self.ax.clear()
+        self._plot_line = None
+        self._added_lines.clear()
         self.ax.grid(True, alpha=0.3)
         self.ax.set_xlabel('x')
         self.ax.set_ylabel('f(x)')
         self.ax.set_title('Function Graph')
-        self.canvas.draw()
+        self.canvas.draw_idle()
     
     # Equation solver functions
     def solve_equation(self):
         """Solve the equation entered by user."""
+        sp = load_sympy()
+        self.last_solution = None
         try:
             equation_str = self.equation_entry.get()
             if not equation_str:
@@ -1288,12 +1118,12 @@ class AdvancedCalculator(ctk.CTk):
             # Parse equation
             if '=' in equation_str_clean:
                 left, right = equation_str_clean.split('=')
-                equation = sp.sympify(left) - sp.sympify(right)
+                equation = sympify(left) - sympify(right)
             else:
-                equation = sp.sympify(equation_str_clean)
+                equation = sympify(equation_str_clean)
             
-            # Detect all variables in the equation
-            variables = list(equation.free_symbols)
+            # Detect all variables in the equation, sorted by name for consistent display
+            variables = tuple(sorted(equation.free_symbols, key=str))
             
             # Display result
             self.solver_result.delete("1.0", "end")
@@ -1303,9 +1133,6 @@ class AdvancedCalculator(ctk.CTk):
                 self.solver_result.insert("end", "No variables found in equation.\n")
                 return
             
-            # Sort variables by name for consistent display
-            variables = sorted(variables, key=lambda s: str(s))
-            
             solver_type = self.solver_type.get()
             
             if len(variables) == 1:
@@ -1314,12 +1141,14 @@ class AdvancedCalculator(ctk.CTk):
                 self.solver_result.insert("end", f"Solving for {var}:\n\n")
                 
                 if solver_type == "Simplify":
-                    solutions = simplify(equation)
+                    solutions = sp.simplify(equation)
+                    self.last_solution = solutions
                     self.solver_result.insert("end", f"Simplified: {solutions}\n")
                 else:
                     solutions = solve(equation, var)
+                    self.last_solution = solutions
                     self.solver_result.insert("end", f"Solution(s):\n")
-                    if isinstance(solutions, list):
+                    if isinstance(solutions, tuple):
                         if len(solutions) == 0:
                             self.solver_result.insert("end", "  No solutions found\n")
                         else:
@@ -1329,18 +1158,21 @@ class AdvancedCalculator(ctk.CTk):
                         self.solver_result.insert("end", f"  {var} = {solutions}\n")
             else:
                 # Multiple variables - solve for each variable
-                self.solver_result.insert("end", f"Variables detected: {', '.join(str(v) for v in variables)}\n\n")
+                self.solver_result.insert("end", f"Variables detected: {', '.join(map(str, variables))}\n\n")
                 
                 if solver_type == "Simplify":
-                    solutions = simplify(equation)
+                    solutions = sp.simplify(equation)
+                    self.last_solution = solutions
                     self.solver_result.insert("end", f"Simplified: {solutions}\n")
                 else:
                     # Try to solve for each variable in terms of others
+                    self.last_solution = {}
                     for var in variables:
                         try:
                             solutions = solve(equation, var)
+                            self.last_solution[var] = solutions
                             self.solver_result.insert("end", f"Solving for {var}:\n")
-                            if isinstance(solutions, list):
+                            if isinstance(solutions, tuple):
                                 if len(solutions) == 0:
                                     self.solver_result.insert("end", "  No solutions found\n")
                                 else:
@@ -1360,11 +1192,14 @@ class AdvancedCalculator(ctk.CTk):
     
     def expand_expression(self):
         """Expand the expression."""
+        sp = load_sympy()
+        self.last_solution = None
         try:
             expr_str = self.equation_entry.get().split('=')[0]
             expr_str_clean = preprocess_math_input(expr_str)
-            expr = sp.sympify(expr_str_clean)
-            result = expand(expr)
+            expr = sympify(expr_str_clean)
+            result = sp.expand(expr)
+            self.last_solution = result
             
             self.solver_result.delete("1.0", "end")
             self.solver_result.insert("1.0", f"Original: {expr_str}\n\n")
@@ -1375,11 +1210,14 @@ class AdvancedCalculator(ctk.CTk):
     
     def factor_expression(self):
         """Factor the expression."""
+        sp = load_sympy()
+        self.last_solution = None
         try:
             expr_str = self.equation_entry.get().split('=')[0]
             expr_str_clean = preprocess_math_input(expr_str)
-            expr = sp.sympify(expr_str_clean)
-            result = factor(expr)
+            expr = sympify(expr_str_clean)
+            result = sp.factor(expr)
+            self.last_solution = result
             
             self.solver_result.delete("1.0", "end")
             self.solver_result.insert("1.0", f"Original: {expr_str}\n\n")
@@ -1390,34 +1228,36 @@ class AdvancedCalculator(ctk.CTk):
     
     def differentiate(self):
         """Differentiate the expression."""
+        sp = load_sympy()
+        self.last_solution = None
         try:
             expr_str = self.equation_entry.get().split('=')[0]
             expr_str_clean = preprocess_math_input(expr_str)
-            expr = sp.sympify(expr_str_clean)
+            expr = sympify(expr_str_clean)
             
-            # Detect all variables
-            variables = list(expr.free_symbols)
+            # Detect all variables, sorted by name for consistent display
+            variables = tuple(sorted(expr.free_symbols, key=str))
             
             if len(variables) == 0:
                 self.solver_result.delete("1.0", "end")
                 self.solver_result.insert("1.0", "No variables found in expression.")
                 return
             
-            # Sort variables by name for consistent display
-            variables = sorted(variables, key=lambda s: str(s))
-            
             self.solver_result.delete("1.0", "end")
-            self.solver_result.insert("1.0", f"f({', '.join(str(v) for v in variables)}) = {expr_str}\n\n")
+            self.solver_result.insert("1.0", f"f({', '.join(map(str, variables))}) = {expr_str}\n\n")
             
             # Differentiate with respect to each variable
             if len(variables) == 1:
                 var = variables[0]
-                result = diff(expr, var)
+                result = sp.diff(expr, var)
+                self.last_solution = result
                 self.solver_result.insert("end", f"f'({var}) = {result}")
             else:
                 self.solver_result.insert("end", "Partial derivatives:\n\n")
+                self.last_solution = {}
                 for var in variables:
-                    result = diff(expr, var)
+                    result = sp.diff(expr, var)
+                    self.last_solution[var] = result
                     self.solver_result.insert("end", f"∂f/∂{var} = {result}\n")
                     
         except Exception as e:
@@ -1426,34 +1266,36 @@ class AdvancedCalculator(ctk.CTk):
     
     def integrate_expression(self):
         """Integrate the expression."""
+        sp = load_sympy()
+        self.last_solution = None
         try:
             expr_str = self.equation_entry.get().split('=')[0]
             expr_str_clean = preprocess_math_input(expr_str)
-            expr = sp.sympify(expr_str_clean)
+            expr = sympify(expr_str_clean)
             
-            # Detect all variables
-            variables = list(expr.free_symbols)
+            # Detect all variables, sorted by name for consistent display
+            variables = tuple(sorted(expr.free_symbols, key=str))
             
             if len(variables) == 0:
                 self.solver_result.delete("1.0", "end")
                 self.solver_result.insert("1.0", "No variables found in expression.")
                 return
             
-            # Sort variables by name for consistent display
-            variables = sorted(variables, key=lambda s: str(s))
-            
             self.solver_result.delete("1.0", "end")
-            self.solver_result.insert("1.0", f"f({', '.join(str(v) for v in variables)}) = {expr_str}\n\n")
+            self.solver_result.insert("1.0", f"f({', '.join(map(str, variables))}) = {expr_str}\n\n")
             
             # Integrate with respect to each variable
             if len(variables) == 1:
                 var = variables[0]
-                result = integrate(expr, var)
+                result = sp.integrate(expr, var)
+                self.last_solution = result
                 self.solver_result.insert("end", f"∫f({var})d{var} = {result} + C")
             else:
                 self.solver_result.insert("end", "Integrals with respect to each variable:\n\n")
+                self.last_solution = {}
                 for var in variables:
-                    result = integrate(expr, var)
+                    result = sp.integrate(expr, var)
+                    self.last_solution[var] = result
                     self.solver_result.insert("end", f"∫f(...)d{var} = {result} + C\n")
                     
         except Exception as e:
@@ -1463,18 +1305,13 @@ class AdvancedCalculator(ctk.CTk):
     # Matrix operations
     def parse_matrix(self, matrix_str: str) -> np.ndarray:
         """Parse matrix from string."""
-        rows = matrix_str.strip().split(';')
-        matrix = []
-        for row in rows:
-            cols = [float(x.strip()) for x in row.split(',')]
-            matrix.append(cols)
-        return np.array(matrix)
+        return parse_matrix(matrix_str)
     
-    def matrix_operation(self, operation: str):
-        """Perform matrix operation."""
+    def matrix_operation(self, operation: str) -> str:
+        """Perform matrix operation and return the text shown as its result."""
+        text = ""
+        self.last_matrix_result = None
         try:
-            self.matrix_result.delete("1.0", "end")
-            
             matrix_a_str = self.matrix_a_entry.get("1.0", "end").strip()
             matrix_a = self.parse_matrix(matrix_a_str)
             
@@ -1482,37 +1319,46 @@ class AdvancedCalculator(ctk.CTk):
                 matrix_b_str = self.matrix_b_entry.get("1.0", "end").strip()
                 matrix_b = self.parse_matrix(matrix_b_str)
                 result = matrix_a + matrix_b
-                self.matrix_result.insert("1.0", f"A + B =\n{result}")
+                self.last_matrix_result = result
+                text = f"A + B =\n{result}"
                 
             elif operation == "subtract":
                 matrix_b_str = self.matrix_b_entry.get("1.0", "end").strip()
                 matrix_b = self.parse_matrix(matrix_b_str)
                 result = matrix_a - matrix_b
-                self.matrix_result.insert("1.0", f"A - B =\n{result}")
+                self.last_matrix_result = result
+                text = f"A - B =\n{result}"
                 
             elif operation == "multiply":
                 matrix_b_str = self.matrix_b_entry.get("1.0", "end").strip()
                 matrix_b = self.parse_matrix(matrix_b_str)
                 result = np.matmul(matrix_a, matrix_b)
-                self.matrix_result.insert("1.0", f"A × B =\n{result}")
+                self.last_matrix_result = result
+                text = f"A × B =\n{result}"
                 
             elif operation == "transpose_a":
                 result = matrix_a.T
-                self.matrix_result.insert("1.0", f"Transpose of A =\n{result}")
+                self.last_matrix_result = result
+                text = f"Transpose of A =\n{result}"
                 
             elif operation == "det_a":
                 det = np.linalg.det(matrix_a)
-                self.matrix_result.insert("1.0", f"Determinant of A = {det}")
+                self.last_matrix_result = det
+                text = f"Determinant of A = {det}"
                 
             elif operation == "inverse_a":
                 inv = np.linalg.inv(matrix_a)
-                self.matrix_result.insert("1.0", f"Inverse of A =\n{inv}")
+                self.last_matrix_result = inv
+                text = f"Inverse of A =\n{inv}"
                 
         except Exception as e:
-            self.matrix_result.delete("1.0", "end")
-            self.matrix_result.insert("1.0", f"Error: {str(e)}\n\n")
-            self.matrix_result.insert("end", "Make sure matrices are properly formatted.\n")
-            self.matrix_result.insert("end", "Example: 1,2,3;4,5,6;7,8,9")
+            text = (f"Error: {str(e)}\n\n"
+                    "Make sure matrices are properly formatted.\n"
+                    "Example: 1,2,3;4,5,6;7,8,9")
+        
+        self.matrix_result.delete("1.0", "end")
+        self.matrix_result.insert("1.0", text)
+        return text
     
     # Conversion functions
     def update_conversion_units(self, category: str):
@@ -1531,16 +1377,7 @@ class AdvancedCalculator(ctk.CTk):
             from_unit = self.from_unit.get()
             to_unit = self.to_unit.get()
             
-            if category == "Temperature":
-                result = self.convert_temperature(value, from_unit, to_unit)
-            else:
-                # Get conversion factors
-                from_factor = self.conversion_data[category][from_unit]
-                to_factor = self.conversion_data[category][to_unit]
-                
-                # Convert to base unit then to target unit
-                base_value = value * from_factor
-                result = base_value / to_factor
+            result = convert_units(value, category, from_unit, to_unit)
             
             self.to_value.configure(state="normal")
             self.to_value.delete(0, "end")
@@ -1556,21 +1393,7 @@ class AdvancedCalculator(ctk.CTk):
     
     def convert_temperature(self, value: float, from_unit: str, to_unit: str) -> float:
         """Convert temperature between units."""
-        # Convert to Celsius first
-        if from_unit == "celsius":
-            celsius = value
-        elif from_unit == "fahrenheit":
-            celsius = (value - 32) * 5/9
-        elif from_unit == "kelvin":
-            celsius = value - 273.15
-        
-        # Convert from Celsius to target
-        if to_unit == "celsius":
-            return celsius
-        elif to_unit == "fahrenheit":
-            return celsius * 9/5 + 32
-        elif to_unit == "kelvin":
-            return celsius + 273.15
+        return convert_temperature(value, from_unit, to_unit)
     
     def handle_keypress(self, event):
         """Handle keyboard input."""
@@ -1580,19 +1403,10 @@ class AdvancedCalculator(ctk.CTk):
         
         key = event.char
         
-        if key in '0123456789.+-*/()':
-            if key == '*':
-                self.append_to_input('*')
-            elif key == '/':
-                self.append_to_input('/')
-            else:
-                self.append_to_input(key)
-        elif event.keysym == 'Return':
-            self.calculate()
-        elif event.keysym == 'BackSpace':
-            self.backspace()
-        elif event.keysym == 'Escape':
-            self.clear()
+        if key in _CALC_KEYS:
+            self.append_to_input(key)
+        elif event.keysym in _KEYSYM_ACTIONS:
+            getattr(self, _KEYSYM_ACTIONS[event.keysym])()
         elif key == '%':
             self.percentage()
 
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Calculation engine for the Advanced Scientific Calculator
+Pure functions with no Tk dependency:
+- Safe arithmetic evaluation
+- Input preprocessing for the graphing and solver tabs
+- Cached SymPy parsing, solving and plotting helpers
+- Scientific function helpers
+- Matrix parsing and unit conversion
+"""
+
+import math
+import ast
+import functools
+import re
+from typing import Optional
+import numpy as np
+
+
+@functools.lru_cache(maxsize=None)
+def load_sympy():
+    """
+    Import SymPy on first use. Only the graphing and solver tabs need it,
+    so the calculator window opens without paying for the import; the
+    window then warms it up on a background thread.
+    """
+    import sympy
+    return sympy
+
+
+@functools.lru_cache(maxsize=None)
+def _x_symbol():
+    """The symbol 'x' used by the graphing tab, created once."""
+    return load_sympy().Symbol('x')
+
+
+@functools.lru_cache(maxsize=256)
+def sympify(expression: str):
+    """Cached sympy.sympify; parsed SymPy expressions are immutable."""
+    return load_sympy().sympify(expression)
+
+
+@functools.lru_cache(maxsize=8)
+def xgrid(x_min: float, x_max: float, num_points: int) -> np.ndarray:
+    """Read-only sample grid for the graph, reused across re-plots."""
+    grid = np.linspace(x_min, x_max, num_points)
+    grid.flags.writeable = False
+    return grid
+
+
+@functools.lru_cache(maxsize=64)
+def lambdify_x(expression: str):
+    """Compile a preprocessed expression in x to a cached NumPy function."""
+    sp = load_sympy()
+    x = _x_symbol()
+    expr = sympify(expression)
+    
+    # Cubic and higher polynomials evaluate faster with Horner's scheme than
+    # with lambdify's code, which raises x to every power separately
+    try:
+        poly = sp.Poly(expr, x)
+    except sp.PolynomialError:
+        poly = None
+    if poly is not None and poly.degree() >= 3:
+        coeffs = poly.all_coeffs()
+        if all(c.is_number and c.is_real for c in coeffs):
+            return functools.partial(np.polynomial.polynomial.polyval,
+                                     c=[float(c) for c in reversed(coeffs)])
+    
+    return sp.lambdify(x, expr, modules=['numpy'])
+
+
+@functools.lru_cache(maxsize=128)
+def solve(equation, var):
+    """Memoized sympy.solve, returning a tuple so cached solutions stay immutable."""
+    solutions = load_sympy().solve(equation, var)
+    return tuple(solutions) if isinstance(solutions, list) else solutions
+
+
+# Function names that may be written without parentheses ('sin x')
+_KNOWN_FUNCS = frozenset([
+    'sin', 'cos', 'tan', 'asin', 'acos', 'atan',
+    'sinh', 'cosh', 'tanh', 'log', 'ln', 'exp',
+    'sqrt', 'abs',
+])
+
+# Compiled once; longest names first so the alternation prefers 'sinh' over 'sin'
+_FUNC_NO_PAREN_RE = re.compile(
+    r'\b(' + '|'.join(sorted(_KNOWN_FUNCS, key=len, reverse=True)) + r')'
+    r'\s+(?!\()([a-zA-Z_]\w*|\d+\.?\d*)'
+)
+_DIGIT_BEFORE_RE = re.compile(r'(?<=\d)(?=[a-zA-Z_(])')
+_CLOSE_PAREN_BEFORE_RE = re.compile(r'\)(?:\s*(?=\()|(?=[a-zA-Z_0-9]))')
+_CALL_RE = re.compile(r'(\w+)\(')
+_LETTER_PAIR_RE = re.compile(r'(?<![^\W_])([^\W_])(?=([^\W_])(?![^\W_]))')
+
+
+def _star_before_paren(match) -> str:
+    """Treat 'x(' as multiplication unless x names a known function."""
+    identifier = match.group(1)
+    if identifier.isalpha() and identifier not in _KNOWN_FUNCS:
+        return identifier + '*('
+    return match.group(0)
+
+
+def _star_between_letters(match) -> str:
+    """Split an isolated two-letter pair such as 'xy' into 'x*y'."""
+    first = match.group(1)
+    if first.isalpha() and match.group(2).isalpha():
+        return first + '*'
+    return first
+
+
+@functools.lru_cache(maxsize=512)
+def preprocess_math_input(expression: str) -> str:
+    """
+    Preprocess mathematical expressions to make them more user-friendly.
+    Handles implicit multiplication, common notations, etc.
+    
+    Examples:
+        '2x' -> '2*x'
+        'x^2' -> 'x**2'
+        '2(x+1)' -> '2*(x+1)'
+        '(x)(y)' -> '(x)*(y)'
+        'sin x' -> 'sin(x)'
+        '2sin(x)' -> '2*sin(x)'
+    """
+    # First, replace ^ with **
+    expr = expression.replace('^', '**')
+    
+    # Step 1: Handle functions without parentheses (sin x -> sin(x))
+    expr = _FUNC_NO_PAREN_RE.sub(r'\1(\2)', expr)
+    
+    # Step 2: Add multiplication after a number followed by a letter or paren
+    # 2x -> 2*x, 2sin -> 2*sin, 2(x) -> 2*(x)
+    expr = _DIGIT_BEFORE_RE.sub('*', expr)
+    
+    # Step 3: Add multiplication after a closing paren
+    # (x)(y) -> (x)*(y), )x -> )*x, )2 -> )*2
+    expr = _CLOSE_PAREN_BEFORE_RE.sub(')*', expr)
+    
+    # Step 4: Add multiplication for letter followed by opening paren (not a function)
+    # x(y) -> x*(y), but sin(y) is left alone
+    expr = _CALL_RE.sub(_star_before_paren, expr)
+    
+    # Step 5: Add multiplication between consecutive single letters (xy -> x*y)
+    # Only isolated pairs are split so function names stay intact
+    return _LETTER_PAIR_RE.sub(_star_between_letters, expr)
+
+
+# Plain decimal literals that int()/float() read exactly as the compiler would
+_NUMBER_LITERAL_RE = re.compile(r'-?(?:0|[1-9][0-9]*|([0-9]+\.[0-9]*|\.[0-9]+))')
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.USub,
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_expression(expression: str):
+    """
+    Parse, validate and compile an expression once per unique input.
+    Only numeric constants and arithmetic operators are accepted, so the
+    resulting code object can be evaluated with empty builtins.
+    """
+    tree = ast.parse(expression, mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported expression: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and (
+                isinstance(node.value, bool)
+                or not isinstance(node.value, (int, float, complex))):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+    return compile(tree, '<calculator>', 'eval')
+
+
+def safe_eval(expression: str) -> float:
+    """
+    Safely evaluate a mathematical expression without using eval() on raw input.
+    Only allows mathematical operations and prevents code injection.
+    """
+    try:
+        # Bare numbers (the common case right after '=') skip the parser entirely
+        literal = _NUMBER_LITERAL_RE.fullmatch(expression)
+        if literal is not None:
+            return float(expression) if literal.group(1) else int(expression)
+        code = _compile_expression(expression)
+        return eval(code, {'__builtins__': {}})
+    except (SyntaxError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid expression: {str(e)}")
+
+
+def negate_literal(text: str) -> Optional[str]:
+    """
+    Flip the sign of a bare, canonically written non-zero number by editing
+    the string. Returns None when the input needs a full evaluation.
+    """
+    body = text[1:] if text.startswith('-') else text
+    if not body.isascii() or not body.replace('.', '', 1).isdigit():
+        return None
+    if '.' in body:
+        if repr(float(body)) != body or float(body) == 0:
+            return None
+    elif body[0] == '0':
+        return None
+    return body if text.startswith('-') else '-' + body
+
+
+# Trig button -> (math function, whether its argument is an angle)
+_TRIG_FUNCTIONS = {
+    'sin': (math.sin, True),
+    'cos': (math.cos, True),
+    'tan': (math.tan, True),
+    'asin': (math.asin, False),
+    'acos': (math.acos, False),
+    'atan': (math.atan, False),
+}
+
+
+def make_trig_function(func: str, degrees: bool):
+    """Return the one-argument function a trig button applies in the given angle mode."""
+    math_func, takes_angle = _TRIG_FUNCTIONS[func]
+    if not degrees:
+        return math_func
+    if takes_angle:
+        return lambda v: math_func(math.radians(v))
+    # Inverse trig functions return an angle
+    return lambda v: math.degrees(math_func(v))
+
+
+# Temperature unit -> (offset, degree numerator, degree denominator), where
+# celsius = (value + offset) * denominator / numerator. Keeping Fahrenheit's
+# 9/5 degree as a ratio lets values like 37°C <-> 98.6°F round-trip exactly.
+_TEMPERATURE_SCALES = {
+    "celsius": (0.0, 1, 1),
+    "fahrenheit": (-32.0, 9, 5),
+    "kelvin": (-273.15, 1, 1),
+}
+
+
+def convert_temperature(value: float, from_unit: str, to_unit: str) -> float:
+    """Convert temperature between units, going through Celsius."""
+    from_offset, from_numerator, from_denominator = _TEMPERATURE_SCALES[from_unit]
+    to_offset, to_numerator, to_denominator = _TEMPERATURE_SCALES[to_unit]
+    celsius = (value + from_offset) * from_denominator / from_numerator
+    return celsius * to_numerator / to_denominator - to_offset
+
+
+# Unit converter categories: unit -> factor to the category's base unit
+CONVERSION_UNITS = {
+    "Length": {
+        "meter": 1,
+        "kilometer": 1000,
+        "centimeter": 0.01,
+        "millimeter": 0.001,
+        "mile": 1609.34,
+        "yard": 0.9144,
+        "foot": 0.3048,
+        "inch": 0.0254
+    },
+    "Weight": {
+        "kilogram": 1,
+        "gram": 0.001,
+        "milligram": 0.000001,
+        "pound": 0.453592,
+        "ounce": 0.0283495,
+        "ton": 1000
+    },
+    "Temperature": _TEMPERATURE_SCALES,
+    "Area": {
+        "sq_meter": 1,
+        "sq_kilometer": 1000000,
+        "sq_mile": 2589988,
+        "sq_yard": 0.836127,
+        "sq_foot": 0.092903,
+        "acre": 4046.86,
+        "hectare": 10000
+    }
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _conversion_ratio(category: str, from_unit: str, to_unit: str) -> float:
+    """Factor that converts a value in from_unit to to_unit."""
+    factors = CONVERSION_UNITS[category]
+    return factors[from_unit] / factors[to_unit]
+
+
+def convert_units(value, category: str, from_unit: str, to_unit: str):
+    """Convert a value, or a NumPy array of values, between units of a category."""
+    if category == "Temperature":
+        return convert_temperature(value, from_unit, to_unit)
+    # Scale by the cached from/to factor ratio
+    return value * _conversion_ratio(category, from_unit, to_unit)
+
+
+def normalize_result(result):
+    """Show integral floats as ints and round other floats to 10 places."""
+    if type(result) is float:
+        return int(result) if result.is_integer() else round(result, 10)
+    return result
+
+
+# 0! .. 170!, the range whose results still fit in a float
+_SMALL_FACTORIALS = tuple(math.factorial(n) for n in range(171))
+
+
+# Larger results run to tens of thousands of digits; recompute them rather than cache them
+_FACTORIAL_CACHE_LIMIT = 10000
+
+
+def factorial(n: int) -> int:
+    """Factorial for the x! button: table lookup, then memoized up to the cache limit."""
+    if 0 <= n < len(_SMALL_FACTORIALS):
+        return _SMALL_FACTORIALS[n]
+    if n > _FACTORIAL_CACHE_LIMIT:
+        return math.factorial(n)
+    return _large_factorial(n)
+
+
+@functools.lru_cache(maxsize=128)
+def _large_factorial(n: int) -> int:
+    """Memoized math.factorial for repeated presses with operands up to the cache limit."""
+    return math.factorial(n)
+
+
+def square_root(value):
+    """Square root for the √ button, exact for perfect-square integers."""
+    if isinstance(value, int) or value.is_integer():
+        n = int(value)
+        root = math.isqrt(n)
+        if root * root == n:
+            return root
+    return math.sqrt(value)
+
+
+def parse_matrix(matrix_str: str) -> np.ndarray:
+    """Parse a matrix written as comma-separated rows joined by ';'."""
+    rows = matrix_str.strip().split(';')
+    if len({row.count(',') for row in rows}) > 1:
+        raise ValueError("All matrix rows must have the same number of columns")
+    # Convert every cell in one NumPy call, then restore the row structure
+    values = np.array(','.join(rows).split(','), dtype=float)
+    return values.reshape(len(rows), -1)
@@ -8,15 +8,18 @@ import sys
 from calculator import AdvancedCalculator
 
 
-def test_basic_calculator():
+def _set_entry(entry, text):
+    """Replace the text of an entry widget."""
+    entry.delete(0, "end")
+    entry.insert(0, text)
+
+
+def check_basic_calculator(calc):
     """Test basic calculator operations."""
     print("\n" + "="*60)
     print("TESTING BASIC CALCULATOR OPERATIONS")
     print("="*60)
     
-    calc = AdvancedCalculator()
-    calc.withdraw()
-    
     tests = [
         ("15+27", "42"),
         ("100-50", "50"),
@@ -31,19 +34,15 @@ def test_basic_calculator():
         status = "✓" if result == expected else "✗"
         print(f"{status} {expr} = {result} (expected: {expected})")
     
-    calc.destroy()
     print("\n✅ Basic calculator tests completed")
 
 
-def test_scientific_functions():
+def check_scientific_functions(calc):
     """Test scientific calculator functions."""
     print("\n" + "="*60)
     print("TESTING SCIENTIFIC FUNCTIONS")
     print("="*60)
     
-    calc = AdvancedCalculator()
-    calc.withdraw()
-    
     # Square root
     calc.current_input = "16"
     calc.square_root()
@@ -65,19 +64,15 @@ def test_scientific_functions():
     calc.trig_function('sin')
     print(f"✓ sin(30°) = {calc.current_input}")
     
-    calc.destroy()
     print("\n✅ Scientific function tests completed")
 
 
-def test_graphing():
+def check_graphing(calc):
     """Test graphing functionality."""
     print("\n" + "="*60)
     print("TESTING GRAPHING FUNCTIONALITY")
     print("="*60)
     
-    calc = AdvancedCalculator()
-    calc.withdraw()
-    
     test_functions = [
         "x**2",
         "sin(x)",
@@ -87,14 +82,12 @@ def test_graphing():
         "cos(x) + sin(x)",
     ]
     
+    _set_entry(calc.x_min_entry, "-10")
+    _set_entry(calc.x_max_entry, "10")
+    
     for func in test_functions:
         try:
-            calc.func_entry.delete(0, "end")
-            calc.func_entry.insert(0, func)
-            calc.x_min_entry.delete(0, "end")
-            calc.x_min_entry.insert(0, "-10")
-            calc.x_max_entry.delete(0, "end")
-            calc.x_max_entry.insert(0, "10")
+            _set_entry(calc.func_entry, func)
             calc.plot_function()
             error = calc.graph_error_label.cget("text")
             if error:
@@ -104,19 +97,15 @@ def test_graphing():
         except Exception as e:
             print(f"✗ Error plotting {func}: {e}")
     
-    calc.destroy()
     print("\n✅ Graphing tests completed")
 
 
-def test_equation_solver():
+def check_equation_solver(calc):
     """Test equation solving functionality."""
     print("\n" + "="*60)
     print("TESTING EQUATION SOLVER")
     print("="*60)
     
-    calc = AdvancedCalculator()
-    calc.withdraw()
-    
     test_equations = [
         ("x**2 - 5*x + 6 = 0", "Quadratic"),
         ("2*x + 5 = 11", "Algebraic"),
@@ -128,86 +117,65 @@ def test_equation_solver():
     
     for equation, eq_type in test_equations:
         try:
-            calc.equation_entry.delete(0, "end")
-            calc.equation_entry.insert(0, equation)
+            _set_entry(calc.equation_entry, equation)
             calc.solver_type.set(eq_type)
             calc.solve_equation()
-            result = calc.solver_result.get("1.0", "end")
-            if "Error" in result:
+            if calc.last_solution is None:
+                result = calc.solver_result.get("1.0", "end")
                 print(f"✗ Error solving {equation}")
                 print(f"  {result[:100]}")
             else:
-                # Show first line of result
-                first_line = result.split('\n')[2] if len(result.split('\n')) > 2 else "solution found"
                 print(f"✓ Solved: {equation}")
-                print(f"  {first_line}")
+                print(f"  {calc.last_solution}")
         except Exception as e:
             print(f"✗ Exception solving {equation}: {e}")
     
-    calc.destroy()
     print("\n✅ Equation solver tests completed")
 
 
-def test_expression_operations():
+def check_expression_operations(calc):
     """Test expand, factor, differentiate, integrate."""
     print("\n" + "="*60)
     print("TESTING EXPRESSION OPERATIONS")
     print("="*60)
     
-    calc = AdvancedCalculator()
-    calc.withdraw()
-    
     # Test expand
-    calc.equation_entry.delete(0, "end")
-    calc.equation_entry.insert(0, "(x + y)**2")
+    _set_entry(calc.equation_entry, "(x + y)**2")
     calc.expand_expression()
-    result = calc.solver_result.get("1.0", "end")
-    print(f"✓ Expand (x+y)²: {result.split('Expanded:')[1].strip()[:30] if 'Expanded:' in result else 'error'}")
+    print(f"✓ Expand (x+y)²: {str(calc.last_solution)[:30] if calc.last_solution is not None else 'error'}")
     
     # Test factor
-    calc.equation_entry.delete(0, "end")
-    calc.equation_entry.insert(0, "x**2 - y**2")
+    _set_entry(calc.equation_entry, "x**2 - y**2")
     calc.factor_expression()
-    result = calc.solver_result.get("1.0", "end")
-    print(f"✓ Factor x²-y²: {result.split('Factored:')[1].strip()[:30] if 'Factored:' in result else 'error'}")
+    print(f"✓ Factor x²-y²: {str(calc.last_solution)[:30] if calc.last_solution is not None else 'error'}")
     
     # Test differentiate (single variable)
-    calc.equation_entry.delete(0, "end")
-    calc.equation_entry.insert(0, "x**3")
+    _set_entry(calc.equation_entry, "x**3")
     calc.differentiate()
-    result = calc.solver_result.get("1.0", "end")
-    print(f"✓ d/dx(x³): {result.split('=')[-1].strip()[:20] if '=' in result else 'error'}")
+    print(f"✓ d/dx(x³): {str(calc.last_solution)[:20] if calc.last_solution is not None else 'error'}")
     
     # Test differentiate (multiple variables - partial derivatives)
-    calc.equation_entry.delete(0, "end")
-    calc.equation_entry.insert(0, "x**2 + y**2")
+    _set_entry(calc.equation_entry, "x**2 + y**2")
     calc.differentiate()
-    result = calc.solver_result.get("1.0", "end")
-    if "∂" in result:
+    if isinstance(calc.last_solution, dict):
         print(f"✓ Partial derivatives of x²+y² computed")
     else:
         print(f"✗ Partial derivatives failed")
     
     # Test integrate
-    calc.equation_entry.delete(0, "end")
-    calc.equation_entry.insert(0, "x**2")
+    _set_entry(calc.equation_entry, "x**2")
     calc.integrate_expression()
-    result = calc.solver_result.get("1.0", "end")
-    print(f"✓ ∫x²dx: {result.split('=')[-1].strip()[:20] if '=' in result else 'error'}")
+    print(f"✓ ∫x²dx: {f'{calc.last_solution} + C'[:20] if calc.last_solution is not None else 'error'}")
     
-    calc.destroy()
     print("\n✅ Expression operation tests completed")
 
 
-def test_matrix_operations():
+def check_matrix_operations(calc):
     """Test matrix operations."""
     print("\n" + "="*60)
     print("TESTING MATRIX OPERATIONS")
     print("="*60)
     
-    calc = AdvancedCalculator()
-    calc.withdraw()
-    
     # Set up test matrices
     calc.matrix_a_entry.delete("1.0", "end")
     calc.matrix_a_entry.insert("1.0", "1,2;3,4")
@@ -218,8 +186,7 @@ def test_matrix_operations():
     
     for op in operations:
         try:
-            calc.matrix_operation(op)
-            result = calc.matrix_result.get("1.0", "end")
+            result = calc.matrix_operation(op)
             if "Error" not in result:
                 print(f"✓ Matrix operation '{op}' successful")
             else:
@@ -227,21 +194,17 @@ def test_matrix_operations():
         except Exception as e:
             print(f"✗ Matrix operation '{op}' error: {e}")
     
-    calc.destroy()
     print("\n✅ Matrix operation tests completed")
 
 
-def test_unit_conversions():
+def check_unit_conversions(calc):
     """Test unit conversion functionality."""
     print("\n" + "="*60)
     print("TESTING UNIT CONVERSIONS")
     print("="*60)
     
-    calc = AdvancedCalculator()
-    calc.withdraw()
-    
     # Test length conversion
-    calc.from_value.insert(0, "1")
+    _set_entry(calc.from_value, "1")
     calc.from_unit.set("meter")
     calc.to_unit.set("centimeter")
     calc.perform_conversion()
@@ -255,7 +218,6 @@ def test_unit_conversions():
     temp_k = calc.convert_temperature(0, "celsius", "kelvin")
     print(f"✓ 0°C = {temp_k}K")
     
-    calc.destroy()
     print("\n✅ Unit conversion tests completed")
 
 
@@ -265,14 +227,18 @@ def main():
     print("CALCULATOR COMPREHENSIVE FEATURE TEST")
     print("="*60)
     
+    # Build the window once; every test drives the same instance
+    calc = AdvancedCalculator()
+    calc.withdraw()
+    
     try:
-        test_basic_calculator()
-        test_scientific_functions()
-        test_graphing()
-        test_equation_solver()
-        test_expression_operations()
-        test_matrix_operations()
-        test_unit_conversions()
+        check_basic_calculator(calc)
+        check_scientific_functions(calc)
+        check_graphing(calc)
+        check_equation_solver(calc)
+        check_expression_operations(calc)
+        check_matrix_operations(calc)
+        check_unit_conversions(calc)
         
         print("\n" + "="*60)
         print("ALL TESTS COMPLETED SUCCESSFULLY! ✅")
@@ -293,6 +259,8 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        calc.destroy()
 
 
 if __name__ == "__main__":
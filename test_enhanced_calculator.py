@@ -5,9 +5,16 @@ Tests all features including graphing, equation solving, matrix operations, and
 """
 
 import unittest
+import atexit
+import functools
 import math
 import numpy as np
-from calculator import AdvancedCalculator, safe_eval
+from calculator import AdvancedCalculator
+from engine import (
+    convert_temperature, convert_units, factorial, load_sympy, make_trig_function,
+    parse_matrix, preprocess_math_input, safe_eval,
+)
+from test_user_friendly_inputs import EQUATION_CASES, EXPRESSION_CASES, GRAPHING_CASES
 
 
 class TestSafeEval(unittest.TestCase):
@@ -30,22 +37,180 @@ class TestSafeEval(unittest.TestCase):
         """Test that malicious code is blocked."""
         with self.assertRaises(ValueError):
             safe_eval("__import__('os').system('echo hack')")
+        with self.assertRaises(ValueError):
+            safe_eval("'a'*3")
+    
+    def test_repeated_evaluation(self):
+        """Test that repeated expressions give consistent results."""
+        for _ in range(3):
+            self.assertEqual(safe_eval("(2+3)*4"), 20)
+        with self.assertRaises(ZeroDivisionError):
+            safe_eval("5/0")
+    
+    def test_number_literals(self):
+        """Test that bare numbers evaluate like their parsed form."""
+        self.assertEqual(safe_eval("42"), 42)
+        self.assertIsInstance(safe_eval("42"), int)
+        self.assertEqual(safe_eval("-3.5"), -3.5)
+        self.assertEqual(safe_eval(".5"), 0.5)
+        self.assertEqual(safe_eval("1e3"), 1000.0)
+        with self.assertRaises(ValueError):
+            safe_eval("007")
+        with self.assertRaises(ValueError):
+            safe_eval("inf")
 
 
-class TestCalculatorCore(unittest.TestCase):
-    """Test core calculator functionality."""
+class TestEngine(unittest.TestCase):
+    """Test the pure calculation functions, which need no window."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = AdvancedCalculator()
-        self.calc.withdraw()
+    def test_parse_matrix(self):
+        """Test matrix parsing."""
+        matrix_str = "1,2,3;4,5,6;7,8,9"
+        matrix = parse_matrix(matrix_str)
+        expected = np.array([[1,2,3],[4,5,6],[7,8,9]])
+        np.testing.assert_array_equal(matrix, expected)
+    
+    def test_temperature_conversion(self):
+        """Test temperature conversions."""
+        # 0°C = 32°F
+        result = convert_temperature(0, "celsius", "fahrenheit")
+        self.assertEqual(result, 32.0)
+        
+        # 100°C = 212°F
+        result = convert_temperature(100, "celsius", "fahrenheit")
+        self.assertEqual(result, 212.0)
+        
+        # 0°C = 273.15K
+        result = convert_temperature(0, "celsius", "kelvin")
+        self.assertEqual(result, 273.15)
+        
+        # 212°F = 100°C, 273.15K = 32°F
+        result = convert_temperature(212, "fahrenheit", "celsius")
+        self.assertAlmostEqual(result, 100.0, places=10)
+        result = convert_temperature(273.15, "kelvin", "fahrenheit")
+        self.assertAlmostEqual(result, 32.0, places=10)
+        
+        # Body temperature round-trips exactly: 37°C = 98.6°F
+        self.assertEqual(convert_temperature(37, "celsius", "fahrenheit"), 98.6)
+        self.assertEqual(convert_temperature(98.6, "fahrenheit", "celsius"), 37.0)
+    
+    def test_length_conversions(self):
+        """Test every length unit pair on a whole array of values at once."""
+        factors = {
+            "meter": 1, "kilometer": 1000, "centimeter": 0.01, "millimeter": 0.001,
+            "mile": 1609.34, "yard": 0.9144, "foot": 0.3048, "inch": 0.0254,
+        }
+        values = np.array([0, 1, 5, 10, 100, -2.5])
+        for from_unit in factors:
+            for to_unit in factors:
+                expected = values * factors[from_unit] / factors[to_unit]
+                result = convert_units(values, "Length", from_unit, to_unit)
+                np.testing.assert_allclose(result, expected, err_msg=f"{from_unit}->{to_unit}")
+        
+        # Temperature goes through the same entry point
+        result = convert_units(np.array([0, 100]), "Temperature", "celsius", "fahrenheit")
+        np.testing.assert_allclose(result, [32, 212])
+    
+    def test_preprocess_math_input(self):
+        """Test the user-friendly input rewriting shared by the graphing and solver tabs."""
+        cases = GRAPHING_CASES + EQUATION_CASES + EXPRESSION_CASES
+        for user_input, expected, description in cases:
+            with self.subTest(description, user_input=user_input):
+                self.assertEqual(preprocess_math_input(user_input), expected)
+    
+    def test_factorial(self):
+        """Test factorials across the lookup table and cache boundaries."""
+        for n in (0, 1, 5, 170, 171, 10000, 10001):
+            self.assertEqual(factorial(n), math.factorial(n))
+        
+        # Negative operands are rejected, not read from the end of the table
+        with self.assertRaises(ValueError):
+            factorial(-1)
+    
+    def test_trig_functions(self):
+        """Test the trig buttons over a table of common angles."""
+        angles = np.array([0, 30, 45, 60, 90])
+        ratios = np.array([0, 0.5, math.sqrt(2)/2, math.sqrt(3)/2, 1])
+        cases = (
+            ("sin", True, angles, ratios),
+            ("cos", True, angles, ratios[::-1]),
+            ("sin", False, np.radians(angles), ratios),
+            ("asin", True, ratios, angles),
+            ("acos", True, ratios[::-1], angles),
+            ("asin", False, ratios, np.radians(angles)),
+        )
+        for func, degrees, values, expected in cases:
+            compute = make_trig_function(func, degrees)
+            result = [compute(v) for v in values]
+            np.testing.assert_allclose(result, expected, atol=1e-10,
+                                       err_msg=f"{func} (degrees={degrees})")
+
+
+class OffscreenGraphCalculator(AdvancedCalculator):
+    """Calculator whose graph renders on an off-screen Agg canvas."""
+    
+    def ensure_graph(self):
+        """Create the figure on a canvas with no Tk widget behind it."""
+        if self.canvas is not None:
+            return
+        
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        
+        self.create_figure()
+        self.canvas = FigureCanvasAgg(self.fig)
+
+
+@functools.lru_cache(maxsize=1)
+def shared_calculator():
+    """Build the hidden calculator every window-driven test class reuses."""
+    calc = OffscreenGraphCalculator()
+    calc.withdraw()
+    # Finish the SymPy import the window starts in the background, so the
+    # first solver or graphing test isn't charged for it
+    load_sympy()
+    atexit.register(_destroy_calculator, calc)
+    return calc
+
+
+def _destroy_calculator(calc):
+    """Clean up the shared calculator when the test process exits."""
+    try:
+        calc.destroy()
+    except Exception:
+        pass
+
+
+class SharedCalculatorTestCase(unittest.TestCase):
+    """Base class sharing one hidden calculator across all window-driven tests."""
     
-    def tearDown(self):
-        """Clean up after tests."""
-        try:
-            self.calc.destroy()
-        except Exception:
-            pass
+    @classmethod
+    def setUpClass(cls):
+        """Reuse the calculator built for the first test class."""
+        cls.calc = shared_calculator()
+    
+    def setUp(self):
+        """Reset the shared calculator to its starting state."""
+        calc = self.calc
+        # Cancel the pending error-clear timer before _init_state drops its id
+        if calc._error_after_id is not None:
+            calc.after_cancel(calc._error_after_id)
+        calc._init_state()
+        # Only reset the graph once a test has built it
+        if calc.canvas is not None:
+            calc.clear_graph()
+        calc.history_text.delete("1.0", "end")
+        for entry in (calc.func_entry, calc.equation_entry, calc.from_value):
+            entry.delete(0, "end")
+        for entry, text in ((calc.x_min_entry, "-10"), (calc.x_max_entry, "10")):
+            entry.delete(0, "end")
+            entry.insert(0, text)
+        calc.solver_result.delete("1.0", "end")
+        calc.matrix_result.delete("1.0", "end")
+        calc.tabview.set("Calculator")
+
+
+class TestCalculatorCore(SharedCalculatorTestCase):
+    """Test core calculator functionality."""
     
     def test_basic_operations(self):
         """Test basic arithmetic operations."""
@@ -62,22 +227,22 @@ class TestCalculatorCore(unittest.TestCase):
         # Square root
         self.calc.current_input = "16"
         self.calc.square_root()
-        self.assertEqual(float(self.calc.current_input), 4.0)
+        self.assertEqual(self.calc.get_value(), 4.0)
         
         # Square
         self.calc.current_input = "5"
         self.calc.square()
-        self.assertEqual(float(self.calc.current_input), 25.0)
+        self.assertEqual(self.calc.get_value(), 25.0)
         
         # Cube root
         self.calc.current_input = "27"
         self.calc.cube_root()
-        self.assertAlmostEqual(float(self.calc.current_input), 3.0, places=10)
+        self.assertAlmostEqual(self.calc.get_value(), 3.0, places=10)
         
         # Factorial
         self.calc.current_input = "5"
         self.calc.factorial()
-        self.assertEqual(float(self.calc.current_input), 120.0)
+        self.assertEqual(self.calc.get_value(), 120.0)
     
     def test_trig_functions_deg(self):
         """Test trigonometric functions in degree mode."""
@@ -86,12 +251,12 @@ class TestCalculatorCore(unittest.TestCase):
         # sin(30°) = 0.5
         self.calc.current_input = "30"
         self.calc.trig_function('sin')
-        self.assertAlmostEqual(float(self.calc.current_input), 0.5, places=10)
+        self.assertAlmostEqual(self.calc.get_value(), 0.5, places=10)
         
         # cos(60°) = 0.5
         self.calc.current_input = "60"
         self.calc.trig_function('cos')
-        self.assertAlmostEqual(float(self.calc.current_input), 0.5, places=10)
+        self.assertAlmostEqual(self.calc.get_value(), 0.5, places=10)
     
     def test_trig_functions_rad(self):
         """Test trigonometric functions in radian mode."""
@@ -100,7 +265,7 @@ class TestCalculatorCore(unittest.TestCase):
         # sin(π/6) = 0.5
         self.calc.current_input = str(math.pi/6)
         self.calc.trig_function('sin')
-        self.assertAlmostEqual(float(self.calc.current_input), 0.5, places=10)
+        self.assertAlmostEqual(self.calc.get_value(), 0.5, places=10)
     
     def test_inverse_trig_functions(self):
         """Test inverse trigonometric functions."""
@@ -109,29 +274,29 @@ class TestCalculatorCore(unittest.TestCase):
         # asin(0.5) = 30°
         self.calc.current_input = "0.5"
         self.calc.trig_function('asin')
-        self.assertAlmostEqual(float(self.calc.current_input), 30.0, places=10)
+        self.assertAlmostEqual(self.calc.get_value(), 30.0, places=10)
     
     def test_log_functions(self):
         """Test logarithmic functions."""
         # log10(100) = 2
         self.calc.current_input = "100"
         self.calc.log_function('log10')
-        self.assertEqual(float(self.calc.current_input), 2.0)
+        self.assertEqual(self.calc.get_value(), 2.0)
         
         # ln(e) = 1
         self.calc.current_input = str(math.e)
         self.calc.log_function('log')
-        self.assertAlmostEqual(float(self.calc.current_input), 1.0, places=10)
+        self.assertAlmostEqual(self.calc.get_value(), 1.0, places=10)
     
     def test_exp_function(self):
         """Test exponential function."""
         self.calc.current_input = "0"
         self.calc.exp_function()
-        self.assertEqual(float(self.calc.current_input), 1.0)
+        self.assertEqual(self.calc.get_value(), 1.0)
         
         self.calc.current_input = "1"
         self.calc.exp_function()
-        self.assertAlmostEqual(float(self.calc.current_input), math.e, places=10)
+        self.assertAlmostEqual(self.calc.get_value(), math.e, places=10)
     
     def test_memory_operations(self):
         """Test memory functions."""
@@ -168,38 +333,18 @@ class TestCalculatorCore(unittest.TestCase):
         self.assertEqual(self.calc.current_input, "")
 
 
-class TestMatrixOperations(unittest.TestCase):
+class TestMatrixOperations(SharedCalculatorTestCase):
     """Test matrix operations."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = AdvancedCalculator()
-        self.calc.withdraw()
-    
-    def tearDown(self):
-        """Clean up after tests."""
-        try:
-            self.calc.destroy()
-        except Exception:
-            pass
-    
-    def test_parse_matrix(self):
-        """Test matrix parsing."""
-        matrix_str = "1,2,3;4,5,6;7,8,9"
-        matrix = self.calc.parse_matrix(matrix_str)
-        expected = np.array([[1,2,3],[4,5,6],[7,8,9]])
-        np.testing.assert_array_equal(matrix, expected)
-    
     def test_matrix_addition(self):
         """Test matrix addition."""
         self.calc.matrix_a_entry.delete("1.0", "end")
         self.calc.matrix_a_entry.insert("1.0", "1,2;3,4")
         self.calc.matrix_b_entry.delete("1.0", "end")
         self.calc.matrix_b_entry.insert("1.0", "5,6;7,8")
-        self.calc.matrix_operation("add")
-        # Result should be in matrix_result textbox
-        result_text = self.calc.matrix_result.get("1.0", "end")
+        result_text = self.calc.matrix_operation("add")
         self.assertIn("A + B", result_text)
+        np.testing.assert_array_equal(self.calc.last_matrix_result, [[6, 8], [10, 12]])
     
     def test_matrix_multiplication(self):
         """Test matrix multiplication."""
@@ -207,42 +352,30 @@ class TestMatrixOperations(unittest.TestCase):
         self.calc.matrix_a_entry.insert("1.0", "1,2;3,4")
         self.calc.matrix_b_entry.delete("1.0", "end")
         self.calc.matrix_b_entry.insert("1.0", "2,0;1,3")
-        self.calc.matrix_operation("multiply")
-        result_text = self.calc.matrix_result.get("1.0", "end")
+        result_text = self.calc.matrix_operation("multiply")
         self.assertIn("A × B", result_text)
+        np.testing.assert_array_equal(self.calc.last_matrix_result, [[4, 6], [10, 12]])
     
     def test_matrix_transpose(self):
         """Test matrix transpose."""
         self.calc.matrix_a_entry.delete("1.0", "end")
         self.calc.matrix_a_entry.insert("1.0", "1,2,3;4,5,6")
-        self.calc.matrix_operation("transpose_a")
-        result_text = self.calc.matrix_result.get("1.0", "end")
+        result_text = self.calc.matrix_operation("transpose_a")
         self.assertIn("Transpose", result_text)
+        np.testing.assert_array_equal(self.calc.last_matrix_result, [[1, 4], [2, 5], [3, 6]])
     
     def test_matrix_determinant(self):
         """Test matrix determinant."""
         self.calc.matrix_a_entry.delete("1.0", "end")
         self.calc.matrix_a_entry.insert("1.0", "1,2;3,4")
-        self.calc.matrix_operation("det_a")
-        result_text = self.calc.matrix_result.get("1.0", "end")
+        result_text = self.calc.matrix_operation("det_a")
         self.assertIn("Determinant", result_text)
+        self.assertAlmostEqual(self.calc.last_matrix_result, -2.0, places=10)
 
 
-class TestConversions(unittest.TestCase):
+class TestConversions(SharedCalculatorTestCase):
     """Test unit conversion functions."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = AdvancedCalculator()
-        self.calc.withdraw()
-    
-    def tearDown(self):
-        """Clean up after tests."""
-        try:
-            self.calc.destroy()
-        except Exception:
-            pass
-    
     def test_length_conversion(self):
         """Test length conversions."""
         # 1 meter = 100 centimeters
@@ -252,37 +385,11 @@ class TestConversions(unittest.TestCase):
         self.calc.perform_conversion()
         result = float(self.calc.to_value.get())
         self.assertAlmostEqual(result, 100.0, places=5)
-    
-    def test_temperature_conversion(self):
-        """Test temperature conversions."""
-        # 0°C = 32°F
-        result = self.calc.convert_temperature(0, "celsius", "fahrenheit")
-        self.assertEqual(result, 32.0)
-        
-        # 100°C = 212°F
-        result = self.calc.convert_temperature(100, "celsius", "fahrenheit")
-        self.assertEqual(result, 212.0)
-        
-        # 0°C = 273.15K
-        result = self.calc.convert_temperature(0, "celsius", "kelvin")
-        self.assertEqual(result, 273.15)
 
 
-class TestGraphing(unittest.TestCase):
+class TestGraphing(SharedCalculatorTestCase):
     """Test graphing functionality."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = AdvancedCalculator()
-        self.calc.withdraw()
-    
-    def tearDown(self):
-        """Clean up after tests."""
-        try:
-            self.calc.destroy()
-        except Exception:
-            pass
-    
     def test_plot_function(self):
         """Test function plotting."""
         self.calc.func_entry.insert(0, "x**2")
@@ -291,53 +398,26 @@ class TestGraphing(unittest.TestCase):
         self.calc.x_max_entry.delete(0, "end")
         self.calc.x_max_entry.insert(0, "5")
         
-        # Should not raise an error
-        try:
-            self.calc.plot_function()
-            success = True
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.plot_function()
+        self.assertEqual(self.calc.graph_error_label.cget("text"), "")
     
     def test_clear_graph(self):
         """Test clearing the graph."""
-        try:
-            self.calc.clear_graph()
-            success = True
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.clear_graph()
 
 
-class TestEquationSolver(unittest.TestCase):
+class TestEquationSolver(SharedCalculatorTestCase):
     """Test equation solver functionality."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = AdvancedCalculator()
-        self.calc.withdraw()
-    
-    def tearDown(self):
-        """Clean up after tests."""
-        try:
-            self.calc.destroy()
-        except Exception:
-            pass
-    
     def test_solve_linear_equation(self):
         """Test solving linear equations."""
         self.calc.equation_entry.insert(0, "2*x + 5 = 11")
         self.calc.solver_type.set("Algebraic")
         
-        try:
-            self.calc.solve_equation()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            # Should contain the solution x = 3
-            self.assertIn("3", result_text)
-        except Exception as e:
-            self.fail(f"Equation solver failed: {e}")
+        self.calc.solve_equation()
+        result_text = self.calc.solver_result.get("1.0", "end")
+        # Should contain the solution x = 3
+        self.assertIn("3", result_text)
     
     def test_solve_quadratic_equation(self):
         """Test solving quadratic equations."""
@@ -345,56 +425,35 @@ class TestEquationSolver(unittest.TestCase):
         self.calc.equation_entry.insert(0, "x**2 - 5*x + 6 = 0")
         self.calc.solver_type.set("Quadratic")
         
-        try:
-            self.calc.solve_equation()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            # Should contain solutions x = 2 and x = 3
-            success = "2" in result_text and "3" in result_text
-            self.assertTrue(success)
-        except Exception as e:
-            self.fail(f"Quadratic solver failed: {e}")
+        self.calc.solve_equation()
+        result_text = self.calc.solver_result.get("1.0", "end")
+        # Should contain solutions x = 2 and x = 3
+        self.assertIn("2", result_text)
+        self.assertIn("3", result_text)
     
     def test_expand_expression(self):
         """Test expression expansion."""
         self.calc.equation_entry.delete(0, "end")
         self.calc.equation_entry.insert(0, "(x+2)*(x+3)")
         
-        try:
-            self.calc.expand_expression()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            self.assertIn("Expanded", result_text)
-        except Exception as e:
-            self.fail(f"Expand failed: {e}")
+        self.calc.expand_expression()
+        result_text = self.calc.solver_result.get("1.0", "end")
+        self.assertIn("Expanded", result_text)
     
     def test_differentiate(self):
         """Test differentiation."""
         self.calc.equation_entry.delete(0, "end")
         self.calc.equation_entry.insert(0, "x**2")
         
-        try:
-            self.calc.differentiate()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            # Derivative of x^2 is 2*x
-            self.assertIn("2*x", result_text)
-        except Exception as e:
-            self.fail(f"Differentiate failed: {e}")
+        self.calc.differentiate()
+        result_text = self.calc.solver_result.get("1.0", "end")
+        # Derivative of x^2 is 2*x
+        self.assertIn("2*x", result_text)
 
 
-class TestUIComponents(unittest.TestCase):
+class TestUIComponents(SharedCalculatorTestCase):
     """Test UI components and interactions."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = AdvancedCalculator()
-        self.calc.withdraw()
-    
-    def tearDown(self):
-        """Clean up after tests."""
-        try:
-            self.calc.destroy()
-        except Exception:
-            pass
-    
     def test_tab_switching(self):
         """Test switching between tabs."""
         tabs = ["Calculator", "Graphing", "Equation Solver", "Matrix", "Conversions"]
@@ -405,13 +464,7 @@ class TestUIComponents(unittest.TestCase):
     
     def test_theme_toggle(self):
         """Test theme toggling."""
-        try:
-            self.calc.toggle_theme()
-            success = True
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.toggle_theme()
     
     def test_history_management(self):
         """Test history functionality."""
@@ -420,6 +473,17 @@ class TestUIComponents(unittest.TestCase):
         
         self.calc.add_to_history("10*2=20")
         self.assertEqual(len(self.calc.history), 2)
+        
+        # History is capped at the 50 most recent entries
+        for i in range(60):
+            self.calc.add_to_history(f"{i}+0={i}")
+        self.assertEqual(len(self.calc.history), 50)
+        self.assertEqual(self.calc.history[0], "10+0=10")
+        self.assertEqual(self.calc.history[-1], "59+0=59")
+        
+        # The sidebar shows only the 10 most recent entries, oldest first
+        expected = "".join(f"{i}+0={i}\n" for i in range(50, 60))
+        self.assertEqual(self.calc.history_text.get("1.0", "end"), expected + "\n")
     
     def test_display_update(self):
         """Test display updates."""
@@ -437,6 +501,7 @@ def run_tests():
     
     # Add all test cases
     suite.addTests(loader.loadTestsFromTestCase(TestSafeEval))
+    suite.addTests(loader.loadTestsFromTestCase(TestEngine))
     suite.addTests(loader.loadTestsFromTestCase(TestCalculatorCore))
     suite.addTests(loader.loadTestsFromTestCase(TestMatrixOperations))
     suite.addTests(loader.loadTestsFromTestCase(TestConversions))
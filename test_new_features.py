@@ -8,24 +8,12 @@ Test suite for new calculator features:
 
 import unittest
 import numpy as np
-from calculator import AdvancedCalculator
+from test_enhanced_calculator import SharedCalculatorTestCase
 
 
-class TestGraphingFixes(unittest.TestCase):
+class TestGraphingFixes(SharedCalculatorTestCase):
     """Test the fixed graphing functionality."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = AdvancedCalculator()
-        self.calc.withdraw()
-    
-    def tearDown(self):
-        """Clean up after tests."""
-        try:
-            self.calc.destroy()
-        except Exception:
-            pass
-    
     def test_plot_basic_function(self):
         """Test plotting a basic function."""
         self.calc.func_entry.insert(0, "x**2")
@@ -34,16 +22,9 @@ class TestGraphingFixes(unittest.TestCase):
         self.calc.x_max_entry.delete(0, "end")
         self.calc.x_max_entry.insert(0, "5")
         
-        try:
-            self.calc.plot_function()
-            # Check that no error label is set
-            self.assertEqual(self.calc.graph_error_label.cget("text"), "")
-            success = True
-        except Exception as e:
-            print(f"Error: {e}")
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.plot_function()
+        # Check that no error label is set
+        self.assertEqual(self.calc.graph_error_label.cget("text"), "")
     
     def test_plot_trig_function(self):
         """Test plotting trigonometric functions."""
@@ -54,14 +35,8 @@ class TestGraphingFixes(unittest.TestCase):
         self.calc.x_max_entry.delete(0, "end")
         self.calc.x_max_entry.insert(0, "10")
         
-        try:
-            self.calc.plot_function()
-            self.assertEqual(self.calc.graph_error_label.cget("text"), "")
-            success = True
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.plot_function()
+        self.assertEqual(self.calc.graph_error_label.cget("text"), "")
     
     def test_plot_inverse_trig_function(self):
         """Test that inverse trig functions work (was broken before fix)."""
@@ -72,14 +47,8 @@ class TestGraphingFixes(unittest.TestCase):
         self.calc.x_max_entry.delete(0, "end")
         self.calc.x_max_entry.insert(0, "0.9")
         
-        try:
-            self.calc.plot_function()
-            self.assertEqual(self.calc.graph_error_label.cget("text"), "")
-            success = True
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.plot_function()
+        self.assertEqual(self.calc.graph_error_label.cget("text"), "")
     
     def test_plot_exponential_function(self):
         """Test plotting exponential functions."""
@@ -90,14 +59,8 @@ class TestGraphingFixes(unittest.TestCase):
         self.calc.x_max_entry.delete(0, "end")
         self.calc.x_max_entry.insert(0, "2")
         
-        try:
-            self.calc.plot_function()
-            self.assertEqual(self.calc.graph_error_label.cget("text"), "")
-            success = True
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.plot_function()
+        self.assertEqual(self.calc.graph_error_label.cget("text"), "")
     
     def test_plot_logarithmic_function(self):
         """Test plotting logarithmic functions."""
@@ -108,14 +71,25 @@ class TestGraphingFixes(unittest.TestCase):
         self.calc.x_max_entry.delete(0, "end")
         self.calc.x_max_entry.insert(0, "10")
         
-        try:
-            self.calc.plot_function()
-            self.assertEqual(self.calc.graph_error_label.cget("text"), "")
-            success = True
-        except Exception:
-            success = False
+        self.calc.plot_function()
+        self.assertEqual(self.calc.graph_error_label.cget("text"), "")
+    
+    def test_plot_constant_function(self):
+        """Test that constant functions are sampled over the whole range."""
+        x_vals, y_vals = self.calc.sample_function("5", -2, 2)
+        self.assertEqual(y_vals.shape, x_vals.shape)
+        self.assertTrue(np.all(y_vals == 5))
         
-        self.assertTrue(success)
+        self.calc.func_entry.delete(0, "end")
+        self.calc.func_entry.insert(0, "5")
+        self.calc.plot_function()
+        self.assertEqual(self.calc.graph_error_label.cget("text"), "")
+    
+    def test_sample_polynomial_function(self):
+        """Test that polynomials are sampled to the same values as the formula."""
+        x_vals, y_vals = self.calc.sample_function("3x^5 - x^3 + 2x - 7", -3, 3)
+        expected = 3 * x_vals**5 - x_vals**3 + 2 * x_vals - 7
+        self.assertTrue(np.allclose(y_vals, expected))
     
     def test_add_function_to_plot(self):
         """Test adding multiple functions to the same plot."""
@@ -127,61 +101,51 @@ class TestGraphingFixes(unittest.TestCase):
         self.calc.func_entry.delete(0, "end")
         self.calc.func_entry.insert(0, "x**3")
         
-        try:
-            self.calc.add_function()
-            self.assertEqual(self.calc.graph_error_label.cget("text"), "")
-            success = True
-        except Exception:
-            success = False
+        self.calc.add_function()
+        self.assertEqual(self.calc.graph_error_label.cget("text"), "")
+    
+    def test_replot_reuses_line(self):
+        """Test that plotting again updates the existing line and drops added functions."""
+        self.calc.func_entry.insert(0, "x**2")
+        self.calc.plot_function()
+        line = self.calc.ax.lines[0]
+        
+        self.calc.func_entry.delete(0, "end")
+        self.calc.func_entry.insert(0, "x**3")
+        self.calc.add_function()
+        
+        self.calc.func_entry.delete(0, "end")
+        self.calc.func_entry.insert(0, "sin(x)")
+        self.calc.plot_function()
         
-        self.assertTrue(success)
+        # The plotted line plus the two axis lines
+        self.assertEqual(len(self.calc.ax.lines), 3)
+        self.assertIs(self.calc.ax.lines[0], line)
+        x_vals, y_vals = line.get_data()
+        self.assertTrue(np.allclose(y_vals, np.sin(x_vals)))
+        self.assertEqual(self.calc.graph_error_label.cget("text"), "")
     
     def test_clear_graph(self):
         """Test clearing the graph."""
         self.calc.func_entry.insert(0, "x**2")
         self.calc.plot_function()
         
-        try:
-            self.calc.clear_graph()
-            success = True
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.clear_graph()
 
 
-class TestMultiVariableSolver(unittest.TestCase):
+class TestMultiVariableSolver(SharedCalculatorTestCase):
     """Test multi-variable equation solving."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = AdvancedCalculator()
-        self.calc.withdraw()
-    
-    def tearDown(self):
-        """Clean up after tests."""
-        try:
-            self.calc.destroy()
-        except Exception:
-            pass
-    
     def test_solve_for_x_in_xy_equation(self):
         """Test solving x + y = 10 for x."""
         self.calc.equation_entry.insert(0, "x + y = 10")
         self.calc.solver_type.set("Algebraic")
         
-        try:
-            self.calc.solve_equation()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            # Should contain x in terms of y
-            self.assertIn("x", result_text.lower())
-            self.assertIn("y", result_text.lower())
-            success = True
-        except Exception as e:
-            print(f"Error: {e}")
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.solve_equation()
+        result_text = self.calc.solver_result.get("1.0", "end")
+        # Should contain x in terms of y
+        self.assertIn("x", result_text.lower())
+        self.assertIn("y", result_text.lower())
     
     def test_solve_for_y_in_xy_equation(self):
         """Test that equation solver shows solution for y too."""
@@ -189,17 +153,11 @@ class TestMultiVariableSolver(unittest.TestCase):
         self.calc.equation_entry.insert(0, "2*x + 3*y = 12")
         self.calc.solver_type.set("Algebraic")
         
-        try:
-            self.calc.solve_equation()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            # Should show solutions for both variables
-            self.assertIn("x", result_text.lower())
-            self.assertIn("y", result_text.lower())
-            success = True
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.solve_equation()
+        result_text = self.calc.solver_result.get("1.0", "end")
+        # Should show solutions for both variables
+        self.assertIn("x", result_text.lower())
+        self.assertIn("y", result_text.lower())
     
     def test_solve_three_variable_equation(self):
         """Test solving equation with three variables."""
@@ -207,18 +165,29 @@ class TestMultiVariableSolver(unittest.TestCase):
         self.calc.equation_entry.insert(0, "x + y + z = 15")
         self.calc.solver_type.set("Algebraic")
         
-        try:
-            self.calc.solve_equation()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            # Should detect all three variables
-            self.assertIn("x", result_text.lower())
-            self.assertIn("y", result_text.lower())
-            self.assertIn("z", result_text.lower())
-            success = True
-        except Exception:
-            success = False
+        self.calc.solve_equation()
+        result_text = self.calc.solver_result.get("1.0", "end")
+        # Should detect all three variables
+        self.assertIn("x", result_text.lower())
+        self.assertIn("y", result_text.lower())
+        self.assertIn("z", result_text.lower())
+    
+    def test_last_solution(self):
+        """Test that solver results are exposed without reading the text widget."""
+        self.calc.equation_entry.insert(0, "2*x + 5 = 11")
+        self.calc.solver_type.set("Algebraic")
+        self.calc.solve_equation()
+        self.assertEqual(list(self.calc.last_solution), [3])
+        
+        self.calc.equation_entry.delete(0, "end")
+        self.calc.equation_entry.insert(0, "x + y = 10")
+        self.calc.solve_equation()
+        self.assertEqual(set(map(str, self.calc.last_solution)), {"x", "y"})
         
-        self.assertTrue(success)
+        self.calc.equation_entry.delete(0, "end")
+        self.calc.equation_entry.insert(0, "x**3")
+        self.calc.differentiate()
+        self.assertEqual(str(self.calc.last_solution), "3*x**2")
     
     def test_quadratic_xy_equation(self):
         """Test solving quadratic equation with x and y."""
@@ -226,118 +195,70 @@ class TestMultiVariableSolver(unittest.TestCase):
         self.calc.equation_entry.insert(0, "x**2 + y = 5")
         self.calc.solver_type.set("Quadratic")
         
-        try:
-            self.calc.solve_equation()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            # Should show solutions for both variables
-            success = "x" in result_text.lower() or "y" in result_text.lower()
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.solve_equation()
+        result_text = self.calc.solver_result.get("1.0", "end").lower()
+        # Should show solutions for both variables
+        self.assertTrue("x" in result_text or "y" in result_text)
 
 
-class TestMultiVariableOperations(unittest.TestCase):
+class TestMultiVariableOperations(SharedCalculatorTestCase):
     """Test multi-variable differentiation and integration."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = AdvancedCalculator()
-        self.calc.withdraw()
-    
-    def tearDown(self):
-        """Clean up after tests."""
-        try:
-            self.calc.destroy()
-        except Exception:
-            pass
-    
     def test_partial_derivative_xy(self):
         """Test partial derivatives with x and y."""
         self.calc.equation_entry.insert(0, "x**2 + y**2")
         
-        try:
-            self.calc.differentiate()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            # Should show partial derivatives
-            self.assertIn("∂", result_text)  # Partial derivative symbol
-            self.assertIn("x", result_text.lower())
-            self.assertIn("y", result_text.lower())
-            success = True
-        except Exception as e:
-            print(f"Error: {e}")
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.differentiate()
+        result_text = self.calc.solver_result.get("1.0", "end")
+        # Should show partial derivatives
+        self.assertIn("∂", result_text)  # Partial derivative symbol
+        self.assertIn("x", result_text.lower())
+        self.assertIn("y", result_text.lower())
     
     def test_partial_derivative_xyz(self):
         """Test partial derivatives with x, y, and z."""
         self.calc.equation_entry.delete(0, "end")
         self.calc.equation_entry.insert(0, "x*y + y*z + x*z")
         
-        try:
-            self.calc.differentiate()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            # Should show partial derivatives for all variables
-            self.assertIn("x", result_text.lower())
-            self.assertIn("y", result_text.lower())
-            self.assertIn("z", result_text.lower())
-            success = True
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.differentiate()
+        result_text = self.calc.solver_result.get("1.0", "end")
+        # Should show partial derivatives for all variables
+        self.assertIn("x", result_text.lower())
+        self.assertIn("y", result_text.lower())
+        self.assertIn("z", result_text.lower())
     
     def test_integrate_multi_variable(self):
         """Test integration with multiple variables."""
         self.calc.equation_entry.delete(0, "end")
         self.calc.equation_entry.insert(0, "x*y")
         
-        try:
-            self.calc.integrate_expression()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            # Should show integrals for both variables
-            self.assertIn("x", result_text.lower())
-            self.assertIn("y", result_text.lower())
-            success = True
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.integrate_expression()
+        result_text = self.calc.solver_result.get("1.0", "end")
+        # Should show integrals for both variables
+        self.assertIn("x", result_text.lower())
+        self.assertIn("y", result_text.lower())
     
     def test_expand_multi_variable(self):
         """Test expanding expressions with multiple variables."""
         self.calc.equation_entry.delete(0, "end")
         self.calc.equation_entry.insert(0, "(x + y)**2")
         
-        try:
-            self.calc.expand_expression()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            # Should expand to x**2 + 2*x*y + y**2
-            self.assertIn("x", result_text.lower())
-            self.assertIn("y", result_text.lower())
-            success = True
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.expand_expression()
+        result_text = self.calc.solver_result.get("1.0", "end")
+        # Should expand to x**2 + 2*x*y + y**2
+        self.assertIn("x", result_text.lower())
+        self.assertIn("y", result_text.lower())
     
     def test_factor_multi_variable(self):
         """Test factoring expressions with multiple variables."""
         self.calc.equation_entry.delete(0, "end")
         self.calc.equation_entry.insert(0, "x**2 - y**2")
         
-        try:
-            self.calc.factor_expression()
-            result_text = self.calc.solver_result.get("1.0", "end")
-            # Should factor to (x - y)*(x + y)
-            self.assertIn("x", result_text.lower())
-            self.assertIn("y", result_text.lower())
-            success = True
-        except Exception:
-            success = False
-        
-        self.assertTrue(success)
+        self.calc.factor_expression()
+        result_text = self.calc.solver_result.get("1.0", "end")
+        # Should factor to (x - y)*(x + y)
+        self.assertIn("x", result_text.lower())
+        self.assertIn("y", result_text.lower())
 
 
 def run_tests():